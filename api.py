@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.pipeline.artifacts import ArtifactStore
+from src.pipeline.errors import PipelineError, ValidationError
+from src.pipeline.jobs import JOB_SUCCEEDED, Job, JobManager
+from src.pipeline.llm import LLMClient
+from src.pipeline.tts import TTSService
+from src.pipeline.validators import validate_extension, validate_filesize
+
+DOWNLOAD_CHUNK_BYTES = 256 * 1024
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+services: dict[str, object] = {}
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    load_dotenv()
+    llm_client = LLMClient()
+    tts_service = TTSService()
+    await run_in_threadpool(llm_client.warm_up)
+    await run_in_threadpool(tts_service.warm_up)
+    services.update(llm_client=llm_client, tts_service=tts_service, jobs=JobManager())
+    try:
+        yield
+    finally:
+        services["jobs"].shutdown()  # type: ignore[attr-defined]
+        services.clear()
+
+
+app = FastAPI(title="AI Football Commentator API", lifespan=lifespan)
+
+
+def _job_manager() -> JobManager:
+    return services["jobs"]  # type: ignore[return-value]
+
+
+def _http_error(exc: PipelineError) -> HTTPException:
+    if isinstance(exc, ValidationError):
+        status_code = 413 if exc.error_code == "file_too_large" else 422
+    elif exc.error_code == "queue_full":
+        status_code = 503
+    else:
+        status_code = 500
+    return HTTPException(
+        status_code=status_code,
+        detail={"error_code": exc.error_code, "message": exc.message, "user_hint": exc.user_hint},
+    )
+
+
+def _parse_content_length(value: str) -> int:
+    try:
+        size = int(value)
+    except ValueError:
+        size = -1
+    if size < 0:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error_code": "invalid_content_length",
+                "message": "Content-Length header is not a valid byte count.",
+                "user_hint": "Send the raw clip as the request body with a correct Content-Length.",
+            },
+        )
+    return size
+
+
+def _get_job(job_id: str) -> Job:
+    job = _job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error_code": "job_not_found", "message": "Unknown job id."})
+    return job
+
+
+def _job_payload(job: Job) -> dict:
+    payload: dict = {
+        "job_id": job.job_id,
+        "state": job.state,
+        "stage": job.current_stage,
+        "progress": round(job.progress, 2),
+    }
+    if job.result is not None:
+        payload.update(
+            commentary_text=job.result.commentary_text,
+            status_notes=job.result.status_notes,
+            duration_s=job.result.duration_s,
+            video_url=f"/jobs/{job.job_id}/video",
+            audio_url=f"/jobs/{job.job_id}/audio",
+        )
+    if job.error is not None:
+        payload["error"] = {
+            "error_code": job.error.error_code,
+            "message": job.error.message,
+            "user_hint": job.error.user_hint,
+        }
+    return payload
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    request: Request,
+    filename: str = Query(..., description="Original clip name; its extension selects the container."),
+    vibe: str = "hype",
+    team_a: str | None = None,
+    team_b: str | None = None,
+    key_moments: str | None = None,
+    language: str | None = "en",
+    tts_provider: str | None = None,
+) -> dict:
+    try:
+        validate_extension(filename)
+        declared_size = request.headers.get("content-length")
+        if declared_size is not None:
+            validate_filesize(_parse_content_length(declared_size))
+    except PipelineError as exc:
+        raise _http_error(exc) from exc
+
+    # The raw request body is the clip; it goes to disk chunk by chunk instead of being buffered.
+    store = ArtifactStore()
+    upload_path = store.new_path(Path(filename).suffix.lower())
+    received = 0
+    try:
+        with upload_path.open("wb") as fh:
+            async for chunk in request.stream():
+                received += len(chunk)
+                validate_filesize(received)
+                await run_in_threadpool(fh.write, chunk)
+    except BaseException as exc:
+        store.cleanup()
+        if isinstance(exc, PipelineError):
+            raise _http_error(exc) from exc
+        raise
+
+    try:
+        # The pipeline reads the upload in place; the store is dropped once the job settles.
+        job = _job_manager().submit(
+            on_finish=lambda _: store.cleanup(),
+            video_path=upload_path,
+            filename=filename,
+            vibe=vibe,
+            team_a=team_a,
+            team_b=team_b,
+            key_moments=key_moments,
+            language=language,
+            tts_provider=tts_provider,
+            llm_client=services["llm_client"],
+            tts_service=services["tts_service"],
+        )
+    except PipelineError as exc:
+        store.cleanup()
+        raise _http_error(exc) from exc
+    return {"job_id": job.job_id, "status_url": f"/jobs/{job.job_id}"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> dict:
+    return _job_payload(_get_job(job_id))
+
+
+@app.delete("/jobs/{job_id}", status_code=204)
+async def delete_job(job_id: str) -> Response:
+    job = _get_job(job_id)
+    _job_manager().discard(job_id)
+    if job.result is not None:
+        await run_in_threadpool(job.result.cleanup)
+    return Response(status_code=204)
+
+
+@app.get("/jobs/{job_id}/video")
+async def download_video(job_id: str, request: Request) -> Response:
+    job = _finished_job(job_id)
+    return _file_response(job.result.video_path, "video/mp4", request.headers.get("range"))  # type: ignore[union-attr]
+
+
+@app.get("/jobs/{job_id}/audio")
+async def download_audio(job_id: str, request: Request) -> Response:
+    job = _finished_job(job_id)
+    audio_path = job.result.audio_path  # type: ignore[union-attr]
+    media_type = "audio/wav" if audio_path.suffix == ".wav" else "audio/mpeg"
+    return _file_response(audio_path, media_type, request.headers.get("range"))
+
+
+def _finished_job(job_id: str) -> Job:
+    job = _get_job(job_id)
+    if job.state != JOB_SUCCEEDED or job.result is None:
+        raise HTTPException(status_code=409, detail={"error_code": "job_not_ready", "message": f"Job is {job.state}."})
+    return job
+
+
+def _iter_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with path.open("rb") as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(DOWNLOAD_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _file_response(path: Path, media_type: str, range_header: str | None) -> Response:
+    try:
+        size = path.stat().st_size
+    except OSError as exc:
+        raise HTTPException(status_code=410, detail={"error_code": "artifact_gone", "message": "Result was removed."}) from exc
+
+    headers = {"Accept-Ranges": "bytes"}
+    match = _RANGE_RE.match(range_header.strip()) if range_header else None
+    if match is None or match.groups() == ("", ""):
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_file(path, start, end - start + 1), status_code=206, media_type=media_type, headers=headers
+    )
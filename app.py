@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import dataclasses
+import time
+from typing import Any
+
 import streamlit as st
 
 from src.pipeline.constants import (
     DEFAULT_TTS_PROVIDER,
+    STAGE_AUDIO,
+    STAGE_LLM,
+    STAGE_MUX,
+    STAGE_TTS,
+    STAGE_VALIDATE,
+    STATUS_CACHED_RESULT,
     STATUS_FALLBACK_TTS,
+    STATUS_FITTED_AUDIO,
     STATUS_MOCK_LLM,
     STATUS_MOCK_TTS,
     STATUS_TRIMMED_AUDIO,
+    STATUS_TRUNCATED_LLM,
 )
-from src.pipeline.errors import ExternalServiceError, MuxingError, PipelineError, ValidationError
+from src.pipeline.errors import PipelineError
+from src.pipeline.health import provider_health
+from src.pipeline.jobs import JOB_CANCELLED, JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, Job, JobManager
+from src.pipeline.llm import LLMClient
 from src.pipeline.models import PipelineResult
-from src.pipeline.processor import generate_commentated_clip
+from src.pipeline.tts import TTSService
 
 PAGE_TITLE = "AI Football Commentator"
 VIBE_LABELS = {
@@ -34,9 +49,45 @@ TTS_PROVIDERS = {
 STATUS_LABELS = {
     STATUS_FALLBACK_TTS: "Fallback voice used",
     STATUS_TRIMMED_AUDIO: "Audio trimmed",
+    STATUS_FITTED_AUDIO: "Commentary sped up",
     STATUS_MOCK_LLM: "Mock commentary",
+    STATUS_TRUNCATED_LLM: "Commentary cut short",
     STATUS_MOCK_TTS: "Placeholder audio",
+    STATUS_CACHED_RESULT: "Cached result",
+}
+STAGE_LABELS = {
+    STAGE_VALIDATE: "Checking clip...",
+    STAGE_LLM: "Writing commentary...",
+    STAGE_TTS: "Recording voice-over...",
+    STAGE_AUDIO: "Mastering audio...",
+    STAGE_MUX: "Rendering video...",
 }
+JOB_POLL_SECONDS = 0.5
+RENDER_POLL_SECONDS = 2.0
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_client() -> LLMClient:
+    client = LLMClient()
+    client.warm_up()
+    return client
+
+
+@st.cache_resource(show_spinner=False)
+def get_tts_service() -> TTSService:
+    service = TTSService()
+    service.warm_up()
+    return service
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_manager() -> JobManager:
+    return JobManager()
+
+
+def get_session_job() -> Job | None:
+    job_id = st.session_state.get("pipeline_job")
+    return get_job_manager().get(job_id) if job_id else None
 
 
 def get_session_result() -> PipelineResult | None:
@@ -50,16 +101,33 @@ def store_session_result(result: PipelineResult) -> None:
     current = get_session_result()
     if current is not None:
         current.cleanup()
+    st.session_state.pop("pipeline_media", None)
     st.session_state["pipeline_result"] = result
 
 
 def clear_session_result() -> None:
+    job_id = st.session_state.pop("pipeline_job", None)
+    if job_id:
+        get_job_manager().discard(job_id)
     current = get_session_result()
     if current is not None:
         current.cleanup()
+    st.session_state.pop("pipeline_media", None)
     st.session_state.pop("pipeline_result", None)
 
 
+def get_result_media(result: PipelineResult) -> dict[str, Any]:
+    # Read each artifact once per result; polling reruns reuse the bytes. The paths key the entry, so the
+    # full-quality render replacing the preview is picked up.
+    key = (str(result.audio_path), str(result.video_path))
+    media = st.session_state.get("pipeline_media")
+    if media is None or media["key"] != key:
+        with result.open_audio() as audio_file, result.open_video() as video_file:
+            media = {"key": key, "audio": audio_file.read(), "video": video_file.read()}
+        st.session_state["pipeline_media"] = media
+    return media
+
+
 st.set_page_config(page_title=PAGE_TITLE, page_icon=":soccer:", layout="wide")
 st.title(PAGE_TITLE)
 st.caption("Upload a silent soccer clip and generate lively commentary audio in under a minute.")
@@ -107,6 +175,11 @@ with st.expander("Advanced options"):
     )
     tts_provider = TTS_PROVIDERS[provider_label]
 
+    provider_states = provider_health.snapshot()
+    if provider_states:
+        st.caption("Voice provider health")
+        st.dataframe(provider_states, hide_index=True, use_container_width=True)
+
 trigger = st.button("Generate commentary", type="primary")
 
 if trigger:
@@ -115,29 +188,45 @@ if trigger:
         st.warning("Please upload a clip before generating commentary.")
     else:
         try:
-            with st.spinner("Building commentary..."):
-                video_bytes = upload.getvalue()
-                result = generate_commentated_clip(
-                    video_bytes=video_bytes,
-                    filename=upload.name,
-                    vibe=vibe_key,
-                    team_a=team_a,
-                    team_b=team_b,
-                    key_moments=key_moments,
-                    language=language_code,
-                    tts_provider=tts_provider,
-                )
-            store_session_result(result)
-            st.success("Commentary ready! Scroll down to preview and download.")
-        except ValidationError as exc:
-            st.error(f"{exc.message}\n\nHint: {exc.user_hint}")
-        except ExternalServiceError as exc:
-            st.error(f"{exc.message}\n\nHint: {exc.user_hint}")
-        except MuxingError as exc:
-            st.error(f"{exc.message}\n\nHint: {exc.user_hint}")
+            upload.seek(0)
+            job = get_job_manager().submit(
+                video_stream=upload,
+                filename=upload.name,
+                vibe=vibe_key,
+                team_a=team_a,
+                team_b=team_b,
+                key_moments=key_moments,
+                language=language_code,
+                tts_provider=tts_provider,
+                llm_client=get_llm_client(),
+                tts_service=get_tts_service(),
+                preview_first=True,
+            )
+            st.session_state["pipeline_job"] = job.job_id
         except PipelineError as exc:
             st.error(f"{exc.message}\n\nHint: {exc.user_hint}")
 
+job = get_session_job()
+if job is not None:
+    if not job.done:
+        idle_label = "Starting..." if job.state == JOB_RUNNING else "Waiting for a free worker..."
+        stage_label = STAGE_LABELS.get(job.current_stage or "", idle_label)
+        st.progress(job.progress, text=stage_label)
+        if st.button("Cancel"):
+            get_job_manager().cancel(job.job_id)
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+    else:
+        st.session_state.pop("pipeline_job", None)
+        get_job_manager().discard(job.job_id)
+        if job.state == JOB_SUCCEEDED and job.result is not None:
+            store_session_result(job.result)
+            st.success("Commentary ready! Scroll down to preview and download.")
+        elif job.state == JOB_FAILED and job.error is not None:
+            st.error(f"{job.error.message}\n\nHint: {job.error.user_hint}")
+        elif job.state == JOB_CANCELLED:
+            st.info("Generation cancelled.")
+
 st.divider()
 
 result = get_session_result()
@@ -152,33 +241,50 @@ if result is not None:
             label = STATUS_LABELS.get(note, note)
             note_cols[idx].success(label)
 
+    if result.full_video_ready and result.pending_video is not None:
+        try:
+            result.wait_for_full_video()
+        except PipelineError as exc:
+            st.warning(f"Full-quality render failed, so the download is the preview.\n\nHint: {exc.user_hint}")
+
+    media = get_result_media(result)
     st.markdown("### Audio preview")
-    with result.audio_path.open("rb") as audio_file:
-        audio_bytes = audio_file.read()
-        mime = "audio/wav" if result.audio_path.suffix == ".wav" else "audio/mpeg"
-        st.audio(audio_bytes, format=mime)
+    mime = "audio/wav" if result.audio_path.suffix == ".wav" else "audio/mpeg"
+    st.audio(media["audio"], format=mime)
 
     st.markdown("### Video preview")
-    with result.video_path.open("rb") as video_file:
-        video_bytes = video_file.read()
-        st.video(video_bytes)
+    if not result.full_video_ready:
+        st.caption("Quick low-resolution preview. The full-quality video is still rendering.")
+    st.video(media["video"])
 
+    # Downloads open the files only when clicked, so reruns never copy the clip for them.
     st.download_button(
         "Download MP4",
-        data=video_bytes,
+        data=result.open_video,
         file_name="commentated_clip.mp4",
         mime="video/mp4",
         use_container_width=True,
+        disabled=not result.full_video_ready,
     )
 
     st.download_button(
         "Download audio only",
-        data=audio_bytes,
+        data=result.open_audio,
         file_name="commentary_audio.wav" if result.audio_path.suffix == ".wav" else "commentary_audio.mp3",
         mime=mime,
         use_container_width=True,
     )
 
+    if result.spans:
+        with st.expander("Stage timings", expanded=False):
+            st.dataframe(
+                [dataclasses.asdict(span) for span in result.spans], hide_index=True, use_container_width=True
+            )
+
     if st.button("Clear result"):
         clear_session_result()
-        st.experimental_rerun()
+        st.rerun()
+
+    if not result.full_video_ready:
+        time.sleep(RENDER_POLL_SECONDS)
+        st.rerun()
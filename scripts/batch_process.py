@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.pipeline.constants import ALLOWED_VIDEO_EXTENSIONS, DEFAULT_LANGUAGE, DEFAULT_TTS_PROVIDER
+from src.pipeline.errors import PipelineError
+from src.pipeline.processor import generate_commentated_clip
+
+CLIP_FIELDS = ("vibe", "team_a", "team_b", "key_moments", "language", "tts_provider")
+
+
+def _clip_id(video_path: Path, base_dir: Path, *, keep_extension: bool = False) -> str:
+    try:
+        relative = video_path.resolve().relative_to(base_dir.resolve())
+    except ValueError:
+        relative = Path(video_path.name)
+    if keep_extension:
+        relative = relative.with_name(relative.name.replace(".", "_"))
+    else:
+        relative = relative.with_suffix("")
+    return str(relative).replace(os.sep, "__").replace("/", "__")
+
+
+def _is_within(path: Path, directory: Path) -> bool:
+    try:
+        path.resolve().relative_to(directory.resolve())
+    except ValueError:
+        return False
+    return True
+
+
+def _load_manifest(manifest_path: Path) -> list[dict[str, Any]]:
+    if manifest_path.suffix.lower() == ".csv":
+        with manifest_path.open(newline="", encoding="utf-8") as fh:
+            return [dict(row) for row in csv.DictReader(fh)]
+    if manifest_path.suffix.lower() == ".jsonl":
+        with manifest_path.open(encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+    entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise ValueError("JSON manifests must contain a list of clip entries.")
+    return entries
+
+
+def collect_jobs(
+    source: Path, defaults: dict[str, Any], *, exclude_dir: Path | None = None
+) -> list[dict[str, Any]]:
+    if source.is_dir():
+        base_dir = source
+        # Outputs written inside the source directory must not come back as clips on the next run.
+        entries: list[dict[str, Any]] = [
+            {"video": str(path)}
+            for path in sorted(source.rglob("*"))
+            if path.is_file()
+            and path.suffix.lower() in ALLOWED_VIDEO_EXTENSIONS
+            and not (exclude_dir is not None and _is_within(path, exclude_dir))
+        ]
+    else:
+        base_dir = source.parent
+        entries = _load_manifest(source)
+
+    video_paths = []
+    for entry in entries:
+        video_path = Path(entry["video"])
+        video_paths.append(video_path if video_path.is_absolute() else base_dir / video_path)
+    # Clips sharing a name but not a container (a.mp4 next to a.webm) keep the extension in their id.
+    derived = [_clip_id(video_path, base_dir) for video_path in video_paths]
+    clashing = {clip_id for clip_id in derived if derived.count(clip_id) > 1}
+
+    jobs: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for entry, video_path, derived_id in zip(entries, video_paths, derived):
+        clip_id = str(
+            entry.get("id") or _clip_id(video_path, base_dir, keep_extension=derived_id in clashing)
+        )
+        if clip_id in seen:
+            raise ValueError(f"Duplicate clip id in batch: {clip_id}")
+        seen.add(clip_id)
+
+        job = {"id": clip_id, "video": str(video_path)}
+        for field in CLIP_FIELDS:
+            value = entry.get(field)
+            job[field] = value if value not in (None, "") else defaults.get(field)
+        jobs.append(job)
+    return jobs
+
+
+def load_completed(report_path: Path, output_dir: Path) -> set[str]:
+    completed: set[str] = set()
+    if not report_path.exists():
+        return completed
+    with report_path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # partially written line from an interrupted run
+            if record.get("status") == "ok" and (output_dir / record.get("video_output", "")).is_file():
+                completed.add(record["id"])
+    return completed
+
+
+def process_clip(job: dict[str, Any], output_dir: str) -> dict[str, Any]:
+    load_dotenv()
+    started = time.perf_counter()
+    record: dict[str, Any] = {"id": job["id"], "video": job["video"]}
+    video_path = Path(job["video"])
+    try:
+        result = generate_commentated_clip(
+            video_path=video_path,
+            filename=video_path.name,
+            vibe=job["vibe"],
+            team_a=job["team_a"],
+            team_b=job["team_b"],
+            key_moments=job["key_moments"],
+            language=job["language"],
+            tts_provider=job["tts_provider"],
+        )
+    except PipelineError as exc:
+        record.update(status="error", error_code=exc.error_code, message=exc.message, user_hint=exc.user_hint)
+    except OSError as exc:
+        record.update(status="error", error_code="io_error", message=str(exc))
+    else:
+        try:
+            video_output = f"{job['id']}.mp4"
+            audio_output = f"{job['id']}{result.audio_path.suffix}"
+            shutil.copyfile(result.video_path, Path(output_dir) / video_output)
+            shutil.copyfile(result.audio_path, Path(output_dir) / audio_output)
+        finally:
+            result.cleanup()
+        record.update(
+            status="ok",
+            commentary_text=result.commentary_text,
+            status_notes=result.status_notes,
+            duration_s=result.duration_s,
+            video_output=video_output,
+            audio_output=audio_output,
+        )
+    record["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def run_batch(
+    source: Path,
+    output_dir: Path,
+    *,
+    workers: int,
+    defaults: dict[str, Any],
+    report_path: Path | None = None,
+    resume: bool = True,
+) -> int:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_path = report_path or output_dir / "report.jsonl"
+    jobs = collect_jobs(source, defaults, exclude_dir=output_dir)
+    completed = load_completed(report_path, output_dir) if resume else set()
+    pending = [job for job in jobs if job["id"] not in completed]
+    print(f"{len(jobs)} clips found, {len(jobs) - len(pending)} already done, {len(pending)} to process.")
+
+    failures = 0
+    batch_started = time.perf_counter()
+    with report_path.open("a" if resume else "w", encoding="utf-8") as report, ProcessPoolExecutor(
+        max_workers=workers
+    ) as pool:
+        futures = {pool.submit(process_clip, job, str(output_dir)): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                record = future.result()
+            except Exception as exc:  # pragma: no cover - worker crashed
+                record = {
+                    "id": job["id"],
+                    "video": job["video"],
+                    "status": "error",
+                    "error_code": "worker_crash",
+                    "message": repr(exc),
+                }
+            failures += record["status"] != "ok"
+            report.write(json.dumps(record, ensure_ascii=False) + "\n")
+            report.flush()
+            print(f"[{record['status']}] {record['id']} ({record.get('elapsed_s', '-')}s)")
+
+    print(f"Finished in {time.perf_counter() - batch_started:.1f}s with {failures} failure(s). Report: {report_path}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate commentary for a directory or manifest of clips.")
+    parser.add_argument("source", type=Path, help="Directory of clips, or a .jsonl/.json/.csv manifest with a 'video' column.")
+    parser.add_argument("output_dir", type=Path, help="Where commentated clips and report.jsonl are written.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--report", type=Path, default=None, help="Report path (default: <output_dir>/report.jsonl).")
+    parser.add_argument("--no-resume", action="store_true", help="Reprocess clips already marked ok in the report.")
+    parser.add_argument("--vibe", default="hype")
+    parser.add_argument("--team-a", default=None)
+    parser.add_argument("--team-b", default=None)
+    parser.add_argument("--key-moments", default=None)
+    parser.add_argument("--language", default=DEFAULT_LANGUAGE)
+    parser.add_argument("--tts-provider", default=os.getenv("TTS_PROVIDER", DEFAULT_TTS_PROVIDER))
+    args = parser.parse_args()
+
+    load_dotenv()
+    failed = run_batch(
+        args.source,
+        args.output_dir,
+        workers=max(1, args.workers),
+        defaults={
+            "vibe": args.vibe,
+            "team_a": args.team_a,
+            "team_b": args.team_b,
+            "key_moments": args.key_moments,
+            "language": args.language,
+            "tts_provider": args.tts_provider,
+        },
+        report_path=args.report,
+        resume=not args.no_resume,
+    )
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.pipeline.llm import LLMClient
+from src.pipeline.mux import mux_audio_with_video, resolve_ffmpeg_binary
+from src.pipeline.processor import generate_commentated_clip
+from src.pipeline.prompting import build_prompt
+from src.pipeline.tts import TTSService
+from src.pipeline.validators import validate_upload
+
+try:  # pragma: no cover - unavailable on Windows
+    import resource
+except ImportError:  # pragma: no cover - peak RSS is reported as null
+    resource = None  # type: ignore
+
+CLIP_STAGES = ("validate", "mux", "end_to_end")
+STAGES = ("validate", "prompt", "llm", "tts", "mux", "end_to_end")
+CONTAINER_ARGS = {
+    "mp4": ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"],
+    "mov": ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"],
+    "webm": ["-c:v", "libvpx-vp9", "-b:v", "1M", "-deadline", "realtime", "-cpu-used", "8"],
+}
+# Caches and the audio bank would turn repeat iterations into lookups, so benchmarks run without them.
+ISOLATED_ENV_VARS = (
+    "LLM_CACHE_DIR",
+    "RESULT_CACHE_DIR",
+    "TTS_PHRASE_CACHE_DIR",
+    "MOCK_AUDIO_BANK_DIR",
+    "REPLICATE_API_TOKEN",
+    "TTS_HEDGE_DELAY",
+    "STREAM_TTS",
+)
+TEAM_A = "Bench United"
+TEAM_B = "Profile FC"
+
+
+class PlaceholderTTSService(TTSService):
+    def _build_provider_chain(self, primary: str) -> list[str]:
+        return []
+
+
+def make_clip(ffmpeg_binary: str, clips_dir: Path, container: str, seconds: int, resolution: str) -> Path:
+    clip_path = clips_dir / f"{container}_{resolution}_{seconds}s.{container}"
+    if clip_path.exists():
+        return clip_path
+    clips_dir.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            ffmpeg_binary,
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size={resolution}:rate=30",
+            "-t",
+            str(seconds),
+            *CONTAINER_ARGS[container],
+            str(clip_path),
+        ],
+        check=True,
+    )
+    return clip_path
+
+
+def _percentile(samples: list[float], quantile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(quantile * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "p50": round(_percentile(samples, 0.5), 3),
+        "p95": round(_percentile(samples, 0.95), 3),
+        "mean": round(statistics.fmean(samples), 3),
+        "min": round(min(samples), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+def _cpu_seconds() -> float:
+    # process_time() has fine resolution for this process; os.times() adds reaped ffmpeg children.
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(self_peak, child_peak) / scale, 1)
+
+
+def _stage_callable(
+    stage: str,
+    clip_path: Path | None,
+    tts_mode: str,
+    llm_client: LLMClient,
+    tts_service: TTSService,
+) -> tuple[Callable[[], list[Path]], list[Path]]:
+    prompt_kwargs = dict(
+        vibe="hype", team_a=TEAM_A, team_b=TEAM_B, key_moments="Quick break, curled finish", language="en"
+    )
+    prompt_ctx = build_prompt(**prompt_kwargs)
+    commentary_text, _ = llm_client.generate(prompt_ctx.prompt, language=prompt_ctx.language)
+
+    def synthesize() -> Path:
+        audio_path, _ = tts_service.synthesize(
+            commentary_text, provider=tts_mode, language=prompt_ctx.language, voice_hint=prompt_ctx.vibe_key
+        )
+        return audio_path
+
+    if stage == "validate":
+
+        def validate() -> list[Path]:
+            validate_upload(clip_path.name, clip_path.stat().st_size, clip_path)
+            return []
+
+        return validate, []
+    if stage == "prompt":
+
+        def prompt() -> list[Path]:
+            build_prompt(**prompt_kwargs)
+            return []
+
+        return prompt, []
+    if stage == "llm":
+
+        def generate() -> list[Path]:
+            llm_client.generate(prompt_ctx.prompt, language=prompt_ctx.language)
+            return []
+
+        return generate, []
+    if stage == "tts":
+        return lambda: [synthesize()], []
+    if stage == "mux":
+        audio_path = synthesize()
+
+        def mux() -> list[Path]:
+            output_path, _ = mux_audio_with_video(clip_path, audio_path)
+            return [output_path]
+
+        return mux, [audio_path]
+    if stage == "end_to_end":
+
+        def run() -> list[Path]:
+            result = generate_commentated_clip(
+                video_path=clip_path,
+                filename=clip_path.name,
+                tts_provider=tts_mode,
+                llm_client=llm_client,
+                tts_service=tts_service,
+                **prompt_kwargs,
+            )
+            result.cleanup()
+            return []
+
+        return run, []
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def run_case(case: dict[str, Any]) -> dict[str, Any]:
+    # Runs in a fresh worker process so peak RSS belongs to this case alone.
+    for name in ISOLATED_ENV_VARS:
+        os.environ.pop(name, None)
+    random.seed(0)
+
+    tts_mode = case["tts"]
+    llm_client = LLMClient(allow_mock_fallback=True)
+    llm_client.api_token = None
+    if tts_mode == "placeholder":
+        tts_service: TTSService = PlaceholderTTSService(default_provider="pyttsx3")
+    else:
+        tts_service = TTSService(default_provider=tts_mode)
+    clip_path = Path(case["clip"]) if case.get("clip") else None
+    operation, fixture_paths = _stage_callable(case["stage"], clip_path, tts_mode, llm_client, tts_service)
+
+    wall_ms: list[float] = []
+    cpu_ms: list[float] = []
+    for iteration in range(case["warmup"] + case["iterations"]):
+        wall_start, cpu_start = time.perf_counter(), _cpu_seconds()
+        produced = operation()
+        wall, cpu = time.perf_counter() - wall_start, _cpu_seconds() - cpu_start
+        for path in produced:
+            path.unlink(missing_ok=True)
+        if iteration >= case["warmup"]:
+            wall_ms.append(wall * 1000)
+            cpu_ms.append(cpu * 1000)
+    for path in fixture_paths:
+        path.unlink(missing_ok=True)
+
+    return {
+        "stage": case["stage"],
+        "clip": case.get("clip_spec"),
+        "tts": tts_mode,
+        "iterations": case["iterations"],
+        "wall_ms": _summary(wall_ms),
+        "cpu_ms": _summary(cpu_ms),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _case_key(result: dict[str, Any]) -> str:
+    clip = result.get("clip") or {}
+    parts = (result["stage"], clip.get("container", "-"), clip.get("resolution", "-"), clip.get("seconds", "-"))
+    return "/".join(str(part) for part in parts)
+
+
+def compare(results: list[dict[str, Any]], baseline_path: Path, threshold: float) -> list[str]:
+    baseline = {_case_key(case): case for case in json.loads(baseline_path.read_text(encoding="utf-8"))["cases"]}
+    regressions: list[str] = []
+    for case in results:
+        previous = baseline.get(_case_key(case))
+        if previous is None or not previous["wall_ms"]["p50"]:
+            continue
+        change = case["wall_ms"]["p50"] / previous["wall_ms"]["p50"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{_case_key(case)}: p50 {previous['wall_ms']['p50']}ms -> {case['wall_ms']['p50']}ms ({change:+.0%})"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic clips with offline providers.")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--containers", nargs="+", default=list(CONTAINER_ARGS), choices=list(CONTAINER_ARGS))
+    parser.add_argument("--durations", nargs="+", type=int, default=[10, 30], help="Clip lengths in seconds.")
+    parser.add_argument("--resolutions", nargs="+", default=["640x360", "1280x720"], help="WIDTHxHEIGHT values.")
+    parser.add_argument("--tts", choices=("placeholder", "pyttsx3"), default="placeholder")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--clips-dir", type=Path, default=Path(tempfile.gettempdir()) / "commentator-bench-clips")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout.")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare p50 latency against.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative p50 slowdown counted as a regression.")
+    args = parser.parse_args()
+
+    ffmpeg_binary = resolve_ffmpeg_binary()
+    if ffmpeg_binary is None:
+        parser.error("ffmpeg is required to generate the synthetic clips.")
+
+    cases: list[dict[str, Any]] = []
+    base_case = {"tts": args.tts, "iterations": args.iterations, "warmup": args.warmup}
+    for stage in args.stages:
+        if stage not in CLIP_STAGES:
+            cases.append({**base_case, "stage": stage})
+            continue
+        for container in args.containers:
+            for resolution in args.resolutions:
+                for seconds in args.durations:
+                    clip_path = make_clip(ffmpeg_binary, args.clips_dir, container, seconds, resolution)
+                    clip_spec = {"container": container, "resolution": resolution, "seconds": seconds}
+                    cases.append({**base_case, "stage": stage, "clip": str(clip_path), "clip_spec": clip_spec})
+
+    results: list[dict[str, Any]] = []
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(run_case, case).result())
+        print(f"{_case_key(results[-1])}: p50 {results[-1]['wall_ms']['p50']}ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ffmpeg": ffmpeg_binary,
+            "tts": args.tts,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+        },
+        "cases": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
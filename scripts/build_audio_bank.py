@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.pipeline.audio_bank import DEFAULT_BANK_TEAM_NAMES, build_audio_bank
+from src.pipeline.constants import VIBE_PROMPTS
+from src.pipeline.mock_commentary import MOCK_COMMENTARY_SLOTS
+from src.pipeline.tts import TTSService
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render the mock commentary lines into an offline audio bank.")
+    parser.add_argument("output_dir", type=Path, help="Bank directory; point MOCK_AUDIO_BANK_DIR at it afterwards.")
+    parser.add_argument("--provider", default="gtts", help="TTS provider used to render the bank (gtts or pyttsx3).")
+    parser.add_argument("--languages", nargs="+", default=list(MOCK_COMMENTARY_SLOTS), help="Language codes.")
+    parser.add_argument("--vibes", nargs="+", default=list(VIBE_PROMPTS), help="Commentary vibes.")
+    parser.add_argument(
+        "--team",
+        action="append",
+        default=[],
+        help="Extra team name to pre-render (repeatable). 'Team A' and 'Team B' are always included.",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    count = build_audio_bank(
+        args.output_dir,
+        TTSService(allow_mock_fallback=False),
+        provider=args.provider,
+        languages=args.languages,
+        vibes=args.vibes,
+        team_names=[*DEFAULT_BANK_TEAM_NAMES, *args.team],
+    )
+    print(f"Rendered {count} fragments into {args.output_dir}")
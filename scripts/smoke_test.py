@@ -19,11 +19,8 @@ def run_smoke(video_path: Path) -> None:
         raise FileNotFoundError(f"Sample clip not found: {video_path}")
 
     load_dotenv()
-    with video_path.open("rb") as fh:
-        video_bytes = fh.read()
-
     result = generate_commentated_clip(
-        video_bytes=video_bytes,
+        video_path=video_path,
         filename=video_path.name,
         vibe="hype",
         team_a="Sample United",
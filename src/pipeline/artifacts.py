@@ -0,0 +1,142 @@
+"""Ownership of the intermediate and final files produced by a pipeline run."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+def artifact_root() -> Path:
+    root = Path(os.getenv("ARTIFACT_DIR") or tempfile.gettempdir())
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def new_scratch_path(suffix: str) -> Path:
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=artifact_root())
+    temp_file.close()
+    return Path(temp_file.name)
+
+
+class Artifact:
+    def __init__(self, path: Path, *, owned: bool = True) -> None:
+        self.suffix = path.suffix
+        self._path: Path | None = path
+        self.owned = owned
+
+    @property
+    def size(self) -> int:
+        return self._path.stat().st_size if self._path is not None else 0
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            raise FileNotFoundError("Artifact was discarded.")
+        return self._path
+
+    def open(self) -> BinaryIO:
+        return self.path.open("rb")
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        with self.path.open("rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def discard(self) -> None:
+        if self._path is not None:
+            if self.owned:
+                self._path.unlink(missing_ok=True)
+            self._path = None
+
+
+class ArtifactStore:
+    def __init__(self, directory: Path | str | None = None) -> None:
+        self._parent = Path(directory) if directory is not None else None
+        self._directory: Path | None = None
+        self._artifacts: list[Artifact] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.cleanup()
+
+    @property
+    def directory(self) -> Path:
+        with self._lock:
+            if self._directory is None:
+                parent = self._parent or artifact_root()
+                parent.mkdir(parents=True, exist_ok=True)
+                self._directory = Path(tempfile.mkdtemp(prefix="commentator-", dir=parent))
+            return self._directory
+
+    def new_path(self, suffix: str) -> Path:
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=self.directory)
+        temp_file.close()
+        return Path(temp_file.name)
+
+    def put_bytes(self, data: bytes | bytearray | memoryview, *, suffix: str) -> Artifact:
+        # ffmpeg, moviepy and the probes all need a real file, so artifacts always live on disk.
+        path = self.new_path(suffix)
+        path.write_bytes(data)
+        return self._track(Artifact(path))
+
+    def put_stream(
+        self,
+        stream: BinaryIO,
+        *,
+        suffix: str,
+        chunk_size: int = 1024 * 1024,
+        limit: int | None = None,
+    ) -> Artifact:
+        remaining = limit
+        path = self.new_path(suffix)
+        with path.open("wb") as out:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = stream.read(size)
+                if not chunk:
+                    break
+                out.write(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+        return self._track(Artifact(path))
+
+    def adopt(self, path: Path) -> Artifact:
+        return self._track(Artifact(path))
+
+    def reference(self, path: Path) -> Artifact:
+        # Caller-owned input: readable through the store but never deleted by it.
+        return self._track(Artifact(path, owned=False))
+
+    def cleanup(self) -> None:
+        with self._lock:
+            artifacts, self._artifacts = self._artifacts, []
+            directory, self._directory = self._directory, None
+        for artifact in artifacts:
+            try:
+                artifact.discard()
+            except OSError:  # pragma: no cover - cleanup best effort
+                pass
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _track(self, artifact: Artifact) -> Artifact:
+        with self._lock:
+            self._artifacts.append(artifact)
+        return artifact
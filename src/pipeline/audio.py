@@ -0,0 +1,71 @@
+"""Helpers for stitching synthesized audio segments together."""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+from typing import Sequence
+
+from .artifacts import new_scratch_path
+
+
+def _strip_id3(data: bytes) -> bytes:
+    if data[:3] != b"ID3" or len(data) < 10:
+        return data
+    tag_size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return data[10 + tag_size:]
+
+
+def _wav_params(path: Path) -> tuple[int, int, int]:
+    with wave.open(str(path), "rb") as wav_file:
+        return wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate()
+
+
+def concat_audio(paths: Sequence[Path], *, crossfade_ms: int = 0) -> Path:
+    if not paths:
+        raise ValueError("No audio segments to concatenate.")
+    if len(paths) == 1:
+        return paths[0]
+    if crossfade_ms > 0:
+        return _concat_with_pydub(paths, crossfade_ms=crossfade_ms)
+
+    suffixes = {path.suffix.lower() for path in paths}
+    if suffixes == {".mp3"}:
+        # MP3 is a stream of self-contained frames, so same-provider segments join byte-wise.
+        output_path = new_scratch_path(".mp3")
+        with output_path.open("wb") as out:
+            for index, path in enumerate(paths):
+                data = path.read_bytes()
+                out.write(data if index == 0 else _strip_id3(data))
+        return output_path
+
+    if suffixes == {".wav"} and len({_wav_params(path) for path in paths}) == 1:
+        output_path = new_scratch_path(".wav")
+        with wave.open(str(paths[0]), "rb") as first:
+            params = first.getparams()
+        with wave.open(str(output_path), "wb") as out:
+            out.setparams(params)
+            for path in paths:
+                with wave.open(str(path), "rb") as segment:
+                    out.writeframes(segment.readframes(segment.getnframes()))
+        return output_path
+
+    return _concat_with_pydub(paths)
+
+
+def _concat_with_pydub(paths: Sequence[Path], *, crossfade_ms: int = 0) -> Path:
+    from pydub import AudioSegment  # type: ignore
+
+    segments = [AudioSegment.from_file(str(path)) for path in paths]
+    frame_rate = max(segment.frame_rate for segment in segments)
+    channels = max(segment.channels for segment in segments)
+    sample_width = max(segment.sample_width for segment in segments)
+    combined = AudioSegment.empty()
+    for segment in segments:
+        segment = segment.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+        fade = min(crossfade_ms, len(combined), len(segment))
+        combined = combined.append(segment, crossfade=fade) if len(combined) else segment
+
+    output_path = new_scratch_path(".wav")
+    combined.export(str(output_path), format="wav")
+    return output_path
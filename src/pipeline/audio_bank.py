@@ -0,0 +1,140 @@
+"""Pre-rendered audio bank that serves mock commentary without live TTS."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .artifacts import new_scratch_path
+from .audio import concat_audio
+from .mock_commentary import MOCK_COMMENTARY_SLOTS, mock_language_key, split_template, template_pattern
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .tts import TTSService
+
+DEFAULT_BANK_TEAM_NAMES = ("Team A", "Team B")
+_INDEX_FILE = "index.json"
+_PLACEHOLDERS = ("{team_a}", "{team_b}")
+
+
+def _bank_dir(root: Path, language_key: str, vibe_key: str) -> Path:
+    return root / language_key / vibe_key.replace(" ", "_")
+
+
+def match_mock_segments(text: str, language_key: str) -> list[str] | None:
+    position = 0
+    segments: list[str] = []
+    for templates in MOCK_COMMENTARY_SLOTS[language_key]:
+        for template in templates:
+            match = template_pattern(template).match(text, position)
+            if match is None:
+                continue
+            for piece in split_template(template):
+                if piece in _PLACEHOLDERS:
+                    segments.append(match.group(piece[1:-1]).strip())
+                else:
+                    segments.append(piece)
+            position = match.end()
+            break
+        else:
+            return None
+    if text[position:].strip():
+        return None
+    return segments
+
+
+class MockAudioBank:
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        self._indexes: dict[tuple[str, str], dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["MockAudioBank"]:
+        directory = os.getenv("MOCK_AUDIO_BANK_DIR")
+        if not directory or not Path(directory).is_dir():
+            return None
+        return cls(directory)
+
+    def assemble(self, text: str, *, language: str, vibe: str) -> Path | None:
+        language_key = mock_language_key(language)
+        index = self._index(language_key, vibe)
+        if not index:
+            return None
+        segments = match_mock_segments(text, language_key)
+        if segments is None:
+            return None
+
+        bank_dir = _bank_dir(self.directory, language_key, vibe)
+        paths: list[Path] = []
+        for segment in segments:
+            file_name = index.get(segment)
+            if file_name is None:
+                return None  # e.g. a custom team name that was not pre-rendered
+            paths.append(bank_dir / file_name)
+
+        if len(paths) > 1:
+            return concat_audio(paths)
+        output_path = new_scratch_path(paths[0].suffix)
+        with output_path.open("wb") as fh, paths[0].open("rb") as src:
+            shutil.copyfileobj(src, fh)
+        return output_path
+
+    def _index(self, language_key: str, vibe_key: str) -> dict[str, str]:
+        with self._lock:
+            cache_key = (language_key, vibe_key)
+            if cache_key not in self._indexes:
+                index_path = _bank_dir(self.directory, language_key, vibe_key) / _INDEX_FILE
+                try:
+                    data = json.loads(index_path.read_text(encoding="utf-8"))
+                    self._indexes[cache_key] = dict(data.get("segments", {}))
+                except (OSError, ValueError):
+                    self._indexes[cache_key] = {}
+            return self._indexes[cache_key]
+
+
+def build_audio_bank(
+    directory: Path | str,
+    tts_service: "TTSService",
+    *,
+    provider: str,
+    languages: Iterable[str],
+    vibes: Iterable[str],
+    team_names: Iterable[str] = DEFAULT_BANK_TEAM_NAMES,
+) -> int:
+    root = Path(directory)
+    team_names = list(team_names)
+    rendered = 0
+    for language_key in languages:
+        texts = {
+            piece
+            for templates in MOCK_COMMENTARY_SLOTS[mock_language_key(language_key)]
+            for template in templates
+            for piece in split_template(template)
+            if piece not in _PLACEHOLDERS
+        }
+        texts.update(name.strip() for name in team_names if name.strip())
+
+        for vibe_key in vibes:
+            bank_dir = _bank_dir(root, mock_language_key(language_key), vibe_key)
+            bank_dir.mkdir(parents=True, exist_ok=True)
+            segments: dict[str, str] = {}
+            for number, text in enumerate(sorted(texts)):
+                audio_path, _ = tts_service.synthesize(
+                    text,
+                    provider=provider,
+                    language=language_key,
+                    voice_hint=vibe_key,
+                )
+                target = bank_dir / f"seg_{number:04d}{audio_path.suffix}"
+                shutil.move(str(audio_path), target)
+                segments[text] = target.name
+                rendered += 1
+
+            index = {"provider": provider, "segments": segments}
+            (bank_dir / _INDEX_FILE).write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    return rendered
@@ -0,0 +1,202 @@
+"""Fits synthesized commentary to the clip on NumPy sample buffers before muxing."""
+
+from __future__ import annotations
+
+import os
+import wave
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+from .artifacts import new_scratch_path
+from .constants import (
+    AUDIO_EDGE_PAD_MS,
+    AUDIO_FADE_MS,
+    AUDIO_FIT_MAX_RATIO,
+    AUDIO_OLA_FRAME_MS,
+    AUDIO_PEAK_DBFS,
+    AUDIO_SILENCE_DB,
+    AUDIO_TARGET_DBFS,
+    CROWD_BED_DBFS,
+    CROWD_DUCK_DB,
+    STAGE_AUDIO,
+    STATUS_FITTED_AUDIO,
+    STATUS_TRIMMED_AUDIO,
+)
+from .metrics import record_provider
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover - audio is muxed as synthesized
+    np = None  # type: ignore
+
+_ENVELOPE_FRAME_MS = 10
+_DUCK_SMOOTHING_MS = 250
+
+
+def fit_audio(
+    audio_path: Path,
+    target_duration_s: float | None,
+    *,
+    output_path: Path | None = None,
+    crowd_bed_path: Path | str | None = None,
+) -> Tuple[Path, float | None, list[str]]:
+    if np is None:
+        return audio_path, None, []
+    try:
+        samples, sample_rate = _decode(audio_path)
+    except Exception:  # pragma: no cover - undecodable audio is muxed as-is
+        return audio_path, None, []
+    if samples.size == 0:
+        return audio_path, None, []
+    record_provider(STAGE_AUDIO, "numpy")
+
+    notes: list[str] = []
+    samples = _trim_silence(samples, sample_rate)
+    target_samples = int(target_duration_s * sample_rate) if target_duration_s else None
+    if target_samples and samples.size > target_samples:
+        ratio = min(samples.size / target_samples, AUDIO_FIT_MAX_RATIO)
+        samples = _time_compress(samples, ratio, sample_rate)
+        notes.append(STATUS_FITTED_AUDIO)
+        if samples.size > target_samples:
+            samples = _fade_out(samples[:target_samples], sample_rate)
+            notes.append(STATUS_TRIMMED_AUDIO)
+    samples = _normalize(samples, sample_rate)
+
+    crowd_bed_path = crowd_bed_path or os.getenv("CROWD_BED_PATH")
+    if crowd_bed_path:
+        bed = _load_bed(str(crowd_bed_path), sample_rate)
+        if bed is not None:
+            samples = _mix_bed(samples, bed, sample_rate, max(samples.size, target_samples or 0))
+
+    output_path = output_path or new_scratch_path(".wav")
+    _write_wav(output_path, samples, sample_rate)
+    return output_path, samples.size / sample_rate, notes
+
+
+def _decode(path: Path) -> Tuple["np.ndarray", int]:
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as wav_file:
+            channels, width, sample_rate = (
+                wav_file.getnchannels(),
+                wav_file.getsampwidth(),
+                wav_file.getframerate(),
+            )
+            raw = wav_file.readframes(wav_file.getnframes())
+    else:
+        from pydub import AudioSegment  # type: ignore
+
+        segment = AudioSegment.from_file(str(path))
+        channels, width, sample_rate = segment.channels, segment.sample_width, segment.frame_rate
+        raw = segment.raw_data
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width in (2, 4):
+        dtype = np.int16 if width == 2 else np.int32
+        samples = np.frombuffer(raw, dtype=dtype).astype(np.float32) / float(np.iinfo(dtype).max)
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+    return samples.reshape(-1, channels).mean(axis=1), sample_rate
+
+
+def _frame_rms(samples: "np.ndarray", frame: int) -> "np.ndarray":
+    count = samples.size // frame
+    if count == 0:
+        return np.sqrt(np.mean(np.square(samples), keepdims=True))
+    return np.sqrt(np.mean(np.square(samples[: count * frame].reshape(count, frame)), axis=1))
+
+
+def _trim_silence(samples: "np.ndarray", sample_rate: int) -> "np.ndarray":
+    frame = max(1, sample_rate * _ENVELOPE_FRAME_MS // 1000)
+    rms = _frame_rms(samples, frame)
+    voiced = np.flatnonzero(rms > rms.max() * 10 ** (AUDIO_SILENCE_DB / 20))
+    if voiced.size == 0:
+        return samples
+    pad = sample_rate * AUDIO_EDGE_PAD_MS // 1000
+    start = max(0, voiced[0] * frame - pad)
+    end = min(samples.size, (voiced[-1] + 1) * frame + pad)
+    return samples[start:end]
+
+
+def _time_compress(samples: "np.ndarray", ratio: float, sample_rate: int) -> "np.ndarray":
+    # Overlap-add with a periodic Hann window at 50% synthesis overlap, which sums to unity gain.
+    hop = max(1, sample_rate * AUDIO_OLA_FRAME_MS // 2000)
+    frame = 2 * hop
+    analysis_hop = hop * ratio
+    if samples.size <= frame or ratio <= 1.0:
+        return samples
+    count = int((samples.size - frame) // analysis_hop) + 1
+    starts = np.round(np.arange(count) * analysis_hop).astype(np.int64)
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame) / frame)
+    frames = samples[starts[:, None] + np.arange(frame)] * window
+
+    output = np.zeros((count + 1, hop), dtype=np.float32)
+    output[:-1] += frames[:, :hop]
+    output[1:] += frames[:, hop:]
+    return output.ravel()
+
+
+def _fade_out(samples: "np.ndarray", sample_rate: int) -> "np.ndarray":
+    fade = min(samples.size, sample_rate * AUDIO_FADE_MS // 1000)
+    if fade:
+        samples = samples.copy()
+        samples[-fade:] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)
+    return samples
+
+
+def _normalize(samples: "np.ndarray", sample_rate: int) -> "np.ndarray":
+    # Gated RMS stands in for loudness: pauses between phrases would otherwise pull the level down.
+    frame = max(1, sample_rate * _ENVELOPE_FRAME_MS // 1000)
+    rms = _frame_rms(samples, frame)
+    active = rms[rms > rms.max() * 10 ** (AUDIO_SILENCE_DB / 20)]
+    level = float(np.sqrt(np.mean(np.square(active)))) if active.size else 0.0
+    peak = float(np.max(np.abs(samples)))
+    if level <= 0 or peak <= 0:
+        return samples
+    gain = min(10 ** (AUDIO_TARGET_DBFS / 20) / level, 10 ** (AUDIO_PEAK_DBFS / 20) / peak)
+    return (samples * gain).astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def _load_bed(path: str, sample_rate: int) -> "np.ndarray | None":
+    try:
+        bed, bed_rate = _decode(Path(path))
+    except Exception:  # pragma: no cover - a missing bed only drops the ambience
+        return None
+    if bed.size == 0:
+        return None
+    if bed_rate != sample_rate:
+        positions = np.arange(int(bed.size * sample_rate / bed_rate)) * (bed_rate / sample_rate)
+        bed = np.interp(positions, np.arange(bed.size), bed).astype(np.float32)
+    peak = float(np.max(np.abs(bed)))
+    return bed * (10 ** (CROWD_BED_DBFS / 20) / peak) if peak > 0 else None
+
+
+def _mix_bed(speech: "np.ndarray", bed: "np.ndarray", sample_rate: int, length: int) -> "np.ndarray":
+    bed = np.resize(bed, length)
+    frame = max(1, sample_rate * _ENVELOPE_FRAME_MS // 1000)
+    padded = np.zeros(length, dtype=np.float32)
+    padded[: speech.size] = speech
+
+    # Speech presence per frame, smoothed so the crowd dips and swells instead of pumping.
+    rms = _frame_rms(np.pad(padded, (0, -length % frame)), frame)
+    presence = np.clip(rms / max(float(rms.max()), 1e-9) * 4.0, 0.0, 1.0)
+    smoothing = max(1, _DUCK_SMOOTHING_MS // _ENVELOPE_FRAME_MS)
+    presence = np.convolve(presence, np.ones(smoothing) / smoothing, mode="same")
+    envelope = np.interp(np.arange(length) / frame, np.arange(presence.size), presence)
+
+    ducked = bed * 10 ** (-CROWD_DUCK_DB * envelope / 20)
+    mixed = padded + ducked
+    peak = float(np.max(np.abs(mixed)))
+    limit = 10 ** (AUDIO_PEAK_DBFS / 20)
+    return (mixed * (limit / peak) if peak > limit else mixed).astype(np.float32)
+
+
+def _write_wav(path: Path, samples: "np.ndarray", sample_rate: int) -> None:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
@@ -0,0 +1,184 @@
+"""Persistent, content-addressed cache of finished pipeline results."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .artifacts import ArtifactStore
+from .constants import (
+    RESULT_CACHE_MAX_MB,
+    RESULT_CACHE_TTL_SECONDS,
+    STATUS_CACHED_RESULT,
+    STATUS_FALLBACK_TTS,
+    STATUS_MOCK_LLM,
+    STATUS_MOCK_TTS,
+    STATUS_TRUNCATED_LLM,
+)
+from .models import MediaInfo, PipelineResult
+from .prompting import PromptContext
+
+_META_FILE = "meta.json"
+# Output produced while a provider was down; serving it for a day would outlive the outage.
+_DEGRADED_NOTES = {STATUS_MOCK_LLM, STATUS_FALLBACK_TTS, STATUS_MOCK_TTS, STATUS_TRUNCATED_LLM}
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for child in path.iterdir():
+        try:
+            total += child.stat().st_size
+        except OSError:  # pragma: no cover - entry removed concurrently
+            continue
+    return total
+
+
+class ResultCache:
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else RESULT_CACHE_MAX_MB * 1024 * 1024
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else RESULT_CACHE_TTL_SECONDS
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultCache"]:
+        directory = os.getenv("RESULT_CACHE_DIR")
+        if not directory:
+            return None
+        max_mb = os.getenv("RESULT_CACHE_MAX_MB")
+        ttl = os.getenv("RESULT_CACHE_TTL_SECONDS")
+        return cls(
+            directory,
+            max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else None,
+            ttl_seconds=float(ttl) if ttl else None,
+        )
+
+    @staticmethod
+    def make_key(video_data: bytes | memoryview, prompt_ctx: PromptContext, tts_provider: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(video_data).digest())
+        payload = json.dumps(
+            {
+                "prompt": prompt_ctx.prompt,
+                "language": prompt_ctx.language,
+                "vibe": prompt_ctx.vibe_key,
+                "tts_provider": tts_provider,
+            },
+            sort_keys=True,
+        )
+        digest.update(payload.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> PipelineResult | None:
+        entry_dir = self.directory / key
+        meta_path = entry_dir / _META_FILE
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if self._is_expired(meta):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        store = ArtifactStore()
+        try:
+            audio_path = self._copy_out(entry_dir / meta["audio_name"], store)
+            video_path = self._copy_out(entry_dir / meta["video_name"], store)
+        except (OSError, KeyError):
+            store.cleanup()
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        os.utime(meta_path, None)
+        media_info = MediaInfo(**meta["media_info"]) if meta.get("media_info") else None
+        status_notes = list(meta.get("status_notes", []))
+        if STATUS_CACHED_RESULT not in status_notes:
+            status_notes.append(STATUS_CACHED_RESULT)
+        return PipelineResult(
+            commentary_text=meta["commentary_text"],
+            audio_path=audio_path,
+            video_path=video_path,
+            duration_s=float(meta["duration_s"]),
+            status_notes=status_notes,
+            media_info=media_info,
+            artifacts=store,
+        )
+
+    def put(self, key: str, result: PipelineResult) -> None:
+        if _DEGRADED_NOTES.intersection(result.status_notes):
+            return
+        entry_dir = self.directory / key
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.directory))
+        try:
+            audio_name = f"audio{result.audio_path.suffix or '.mp3'}"
+            video_name = f"video{result.video_path.suffix or '.mp4'}"
+            shutil.copyfile(result.audio_path, staging_dir / audio_name)
+            shutil.copyfile(result.video_path, staging_dir / video_name)
+            meta = {
+                "commentary_text": result.commentary_text,
+                "duration_s": result.duration_s,
+                "status_notes": result.status_notes,
+                "audio_name": audio_name,
+                "video_name": video_name,
+                "media_info": dataclasses.asdict(result.media_info) if result.media_info else None,
+                "created_at": time.time(),
+            }
+            (staging_dir / _META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging_dir, entry_dir)
+        except OSError:  # pragma: no cover - cache writes are best effort
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            for entry_dir in self.directory.iterdir():
+                if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                    continue
+                meta_path = entry_dir / _META_FILE
+                try:
+                    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                    last_access = meta_path.stat().st_mtime
+                except (OSError, ValueError):
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                    continue
+                if self._is_expired(meta):
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                    continue
+                entries.append((last_access, _dir_size(entry_dir), entry_dir))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_dir in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+
+    def _is_expired(self, meta: dict) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        return time.time() - float(meta.get("created_at", 0.0)) > self.ttl_seconds
+
+    def _copy_out(self, source: Path, store: ArtifactStore) -> Path:
+        output_path = store.new_path(source.suffix)
+        with output_path.open("wb") as fh, source.open("rb") as src:
+            shutil.copyfileobj(src, fh)
+        return output_path
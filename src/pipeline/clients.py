@@ -0,0 +1,83 @@
+"""Process-wide, connection-pooled Replicate and HTTP clients."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS, REPLICATE_TIMEOUT_SECONDS
+from .errors import ExternalServiceError
+
+try:  # pragma: no cover - optional dependency path
+    import replicate  # type: ignore
+except ImportError:  # pragma: no cover - handled by callers
+    replicate = None  # type: ignore
+
+try:  # pragma: no cover - installed alongside replicate
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover - fall back to replicate's defaults
+    httpx = None  # type: ignore
+
+_lock = threading.Lock()
+_replicate_clients: dict[str, Any] = {}
+_http_session: requests.Session | None = None
+
+
+def pool_size() -> int:
+    return int(os.getenv("HTTP_POOL_SIZE", HTTP_POOL_SIZE))
+
+
+def http_timeout() -> float:
+    return float(os.getenv("HTTP_TIMEOUT_SECONDS", HTTP_TIMEOUT_SECONDS))
+
+
+def replicate_timeout() -> float:
+    return float(os.getenv("REPLICATE_TIMEOUT_SECONDS", REPLICATE_TIMEOUT_SECONDS))
+
+
+def get_replicate_client(api_token: str) -> Any:
+    if replicate is None:
+        raise ExternalServiceError(
+            message="Replicate client library is not installed.",
+            error_code="replicate_missing",
+            user_hint="Run `pip install replicate` and retry."
+        )
+
+    with _lock:
+        client = _replicate_clients.get(api_token)
+        if client is None:
+            client_kwargs: dict[str, Any] = {"timeout": replicate_timeout()}
+            if httpx is not None:
+                size = pool_size()
+                client_kwargs["transport"] = httpx.HTTPTransport(
+                    limits=httpx.Limits(max_connections=size, max_keepalive_connections=size)
+                )
+            client = replicate.Client(api_token=api_token, **client_kwargs)
+            _replicate_clients[api_token] = client
+        return client
+
+
+def get_http_session() -> requests.Session:
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            size = pool_size()
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def reset_clients() -> None:
+    global _http_session
+    with _lock:
+        _replicate_clients.clear()
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
@@ -9,6 +9,55 @@ DEFAULT_LANGUAGE = "en"
 DEFAULT_TTS_PROVIDER = "gtts"
 REPLICATE_LLM_MODEL = "meta/meta-llama-3-8b-instruct"
 REPLICATE_TTS_MODEL = ""  # Fill with preferred model identifier when available
+DEFAULT_MUX_BACKEND = "ffmpeg"
+MP4_COPY_VIDEO_CODECS = {"h264", "hevc", "mpeg4", "av1"}
+PREVIEW_MAX_HEIGHT = 360
+PREVIEW_CRF = 30
+PREVIEW_AUDIO_BITRATE = "96k"
+AUDIO_FIT_MAX_RATIO = 1.25
+AUDIO_OLA_FRAME_MS = 40
+AUDIO_TARGET_DBFS = -16.0
+AUDIO_PEAK_DBFS = -1.0
+AUDIO_SILENCE_DB = -40.0
+AUDIO_EDGE_PAD_MS = 60
+AUDIO_FADE_MS = 40
+CROWD_BED_DBFS = -20.0
+CROWD_DUCK_DB = 12.0
+STREAM_TTS_WORKERS = 2
+MIN_TTS_CHUNK_CHARS = 24
+HTTP_POOL_SIZE = 10
+HTTP_TIMEOUT_SECONDS = 20
+REPLICATE_TIMEOUT_SECONDS = 60
+LLM_CACHE_MAX_ENTRIES = 256
+TTS_PHRASE_CACHE_MAX_MB = 256
+TTS_PHRASE_MISS_WORKERS = 4
+TTS_CHUNK_CROSSFADE_MS = 30
+PYTTSX3_JOB_TIMEOUT_SECONDS = 30
+PYTTSX3_STARTUP_TIMEOUT_SECONDS = 15
+RESULT_CACHE_MAX_MB = 512
+RESULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+HEALTH_WINDOW_SIZE = 50
+BREAKER_ERROR_RATE = 0.5
+BREAKER_MIN_SAMPLES = 4
+BREAKER_CONSECUTIVE_FAILURES = 3
+BREAKER_COOLDOWN_SECONDS = 30
+SLOW_PROVIDER_P90_SECONDS = 8
+TTS_HEDGE_DELAY_SECONDS = 2.0
+TTS_HEDGE_PROVIDER = "pyttsx3"
+JOB_WORKERS = 2
+JOB_MAX_PENDING = 16
+JOB_RETENTION_SECONDS = 60 * 60
+RENDER_WORKERS = 1
+
+STAGE_VALIDATE = "validate"
+STAGE_LLM = "llm"
+STAGE_TTS = "tts"
+STAGE_AUDIO = "audio"
+STAGE_MUX = "mux"
+PIPELINE_STAGES = (STAGE_VALIDATE, STAGE_LLM, STAGE_TTS, STAGE_AUDIO, STAGE_MUX)
+
+PROFILE_TOP_N = 25
+PROFILE_TRACEMALLOC_FRAMES = 1
 
 VIBE_PROMPTS = {
     "hype": "Maximum adrenaline, breathless goal call, celebrate the moment like a cup final.",
@@ -26,5 +75,9 @@ GTTS_TLD_BY_VIBE = {
 
 STATUS_FALLBACK_TTS = "Used fallback TTS"
 STATUS_TRIMMED_AUDIO = "Trimmed audio to video length"
+STATUS_FITTED_AUDIO = "Sped up commentary to fit the clip"
 STATUS_MOCK_LLM = "Used mock commentary generator"
+STATUS_TRUNCATED_LLM = "Commentary stream was cut short"
 STATUS_MOCK_TTS = "Rendered placeholder audio"
+STATUS_HEDGED_TTS = "Hedged TTS won by"
+STATUS_CACHED_RESULT = "Served from result cache"
@@ -25,3 +25,7 @@ class ExternalServiceError(PipelineError):
 
 class MuxingError(PipelineError):
     pass
+
+
+class CancellationError(PipelineError):
+    pass
@@ -0,0 +1,158 @@
+"""Per-provider health tracking and circuit breaking for external services."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from .constants import (
+    BREAKER_COOLDOWN_SECONDS,
+    BREAKER_ERROR_RATE,
+    BREAKER_MIN_SAMPLES,
+    BREAKER_CONSECUTIVE_FAILURES,
+    HEALTH_WINDOW_SIZE,
+    SLOW_PROVIDER_P90_SECONDS,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: int = HEALTH_WINDOW_SIZE,
+        error_rate_threshold: float = BREAKER_ERROR_RATE,
+        min_samples: int = BREAKER_MIN_SAMPLES,
+        consecutive_failures: int = BREAKER_CONSECUTIVE_FAILURES,
+        cooldown_s: float = BREAKER_COOLDOWN_SECONDS,
+        slow_p90_s: float = SLOW_PROVIDER_P90_SECONDS,
+    ) -> None:
+        self.name = name
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.consecutive_failures_threshold = consecutive_failures
+        self.cooldown_s = cooldown_s
+        self.slow_p90_s = slow_p90_s
+        self._outcomes: deque[tuple[float, bool]] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def is_available(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            return state == STATE_CLOSED or (state == STATE_HALF_OPEN and not self._probe_in_flight)
+
+    def is_degraded(self) -> bool:
+        p90 = self.latency_percentile(0.9)
+        return p90 is not None and p90 > self.slow_p90_s
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency_s: float) -> None:
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                # Recovered: start a fresh window so old failures do not re-trip the breaker.
+                self._outcomes.clear()
+                self._state = STATE_CLOSED
+                self._probe_in_flight = False
+            self._outcomes.append((latency_s, True))
+            self._consecutive_failures = 0
+
+    def record_failure(self, latency_s: float) -> None:
+        with self._lock:
+            self._outcomes.append((latency_s, False))
+            self._consecutive_failures += 1
+            if self._current_state() == STATE_HALF_OPEN or self._should_trip():
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def latency_percentile(self, quantile: float) -> float | None:
+        with self._lock:
+            latencies = sorted(latency for latency, _ in self._outcomes)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(quantile * (len(latencies) - 1))))
+        return latencies[index]
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            samples = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+        p50 = self.latency_percentile(0.5)
+        p90 = self.latency_percentile(0.9)
+        return {
+            "provider": self.name,
+            "state": state,
+            "samples": samples,
+            "error_rate": round(failures / samples, 3) if samples else 0.0,
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p90_s": round(p90, 3) if p90 is not None else None,
+            "degraded": p90 is not None and p90 > self.slow_p90_s,
+        }
+
+    def _current_state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.cooldown_s:
+            self._state = STATE_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def _should_trip(self) -> bool:
+        if self._consecutive_failures >= self.consecutive_failures_threshold:
+            return True
+        samples = len(self._outcomes)
+        if samples < self.min_samples:
+            return False
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / samples >= self.error_rate_threshold
+
+
+class ProviderHealthRegistry:
+    def __init__(self) -> None:
+        self._providers: dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderHealth:
+        with self._lock:
+            health = self._providers.get(provider)
+            if health is None:
+                health = ProviderHealth(provider)
+                self._providers[provider] = health
+            return health
+
+    def order(self, providers: list[str]) -> list[str]:
+        available = [provider for provider in providers if self.get(provider).is_available()]
+        healthy = [provider for provider in available if not self.get(provider).is_degraded()]
+        degraded = [provider for provider in available if provider not in healthy]
+        return healthy + degraded
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            providers = list(self._providers.values())
+        return [health.snapshot() for health in providers]
+
+
+provider_health = ProviderHealthRegistry()
@@ -0,0 +1,190 @@
+"""Background execution of pipeline runs with progress and cancellation."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .constants import JOB_MAX_PENDING, JOB_RETENTION_SECONDS, JOB_WORKERS, PIPELINE_STAGES
+from .errors import CancellationError, PipelineError
+from .models import PipelineResult
+from .processor import generate_commentated_clip
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+_FINAL_STATES = {JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED}
+
+
+@dataclass
+class StageEvent:
+    stage: str
+    status: str
+    at: float
+
+
+@dataclass
+class Job:
+    job_id: str
+    state: str = JOB_QUEUED
+    events: list[StageEvent] = field(default_factory=list)
+    result: PipelineResult | None = None
+    error: PipelineError | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    on_finish: Callable[["Job"], None] | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.state in _FINAL_STATES
+
+    @property
+    def failed_stage(self) -> str | None:
+        with self._lock:
+            failed = [event.stage for event in self.events if event.status == "failed"]
+        return failed[0] if failed else None
+
+    @property
+    def current_stage(self) -> str | None:
+        failed_stage = self.failed_stage
+        if failed_stage is not None:
+            return failed_stage
+        with self._lock:
+            started = [event.stage for event in self.events if event.status == "started"]
+            settled = {event.stage for event in self.events if event.status in ("finished", "failed")}
+        active = [stage for stage in started if stage not in settled]
+        return active[-1] if active else None
+
+    @property
+    def progress(self) -> float:
+        # Validation and speech run side by side, and speech is thrown away when validation fails; only the
+        # unbroken run of finished stages in pipeline order counts, so a discarded sibling never adds progress.
+        with self._lock:
+            finished = {event.stage for event in self.events if event.status == "finished"}
+        completed = 0
+        for stage in PIPELINE_STAGES:
+            if stage not in finished:
+                break
+            completed += 1
+        return completed / len(PIPELINE_STAGES)
+
+    def record_stage(self, stage: str, status: str) -> None:
+        with self._lock:
+            self.events.append(StageEvent(stage=stage, status=status, at=time.time()))
+
+
+class JobManager:
+    def __init__(self, *, max_workers: int | None = None, max_pending: int | None = None) -> None:
+        # The worker count is the global concurrency limit; a burst of submissions waits in the queue.
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS") or JOB_WORKERS)
+        self.max_pending = max_pending or int(os.getenv("JOB_MAX_PENDING") or JOB_MAX_PENDING)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-job")
+        self._jobs: dict[str, Job] = {}
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, *, on_finish: Callable[[Job], None] | None = None, **pipeline_kwargs: Any) -> Job:
+        self._prune()
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.done)
+            if pending >= self.max_pending:
+                raise PipelineError(
+                    message="Too many clips are being processed right now.",
+                    error_code="queue_full",
+                    user_hint="Wait for a running generation to finish and retry."
+                )
+            job = Job(job_id=uuid.uuid4().hex, on_finish=on_finish)
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = self._executor.submit(self._run, job, pipeline_kwargs)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            future = self._futures.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel_event.set()
+        if future is not None and future.cancel():
+            self._finish(job, JOB_CANCELLED)
+        return True
+
+    def discard(self, job_id: str) -> None:
+        self.cancel(job_id)
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, pipeline_kwargs: dict[str, Any]) -> None:
+        if job.cancel_event.is_set():
+            self._finish(job, JOB_CANCELLED)
+            return
+        job.state = JOB_RUNNING
+        try:
+            result = generate_commentated_clip(
+                **pipeline_kwargs,
+                on_stage=job.record_stage,
+                cancel_event=job.cancel_event,
+            )
+        except CancellationError:
+            self._finish(job, JOB_CANCELLED)
+            return
+        except PipelineError as exc:
+            job.error = exc
+            self._finish(job, JOB_FAILED)
+            return
+        except Exception as exc:  # pragma: no cover - defensive catch-all
+            job.error = PipelineError(
+                message="Unexpected pipeline failure.",
+                error_code="pipeline_failure",
+                user_hint="Please retry; if the issue persists, contact support."
+            )
+            job.error.__cause__ = exc
+            self._finish(job, JOB_FAILED)
+            return
+
+        if job.cancel_event.is_set():
+            result.cleanup()
+            self._finish(job, JOB_CANCELLED)
+            return
+        job.result = result
+        self._finish(job, JOB_SUCCEEDED)
+
+    def _prune(self) -> None:
+        # Results nobody came back for would otherwise keep their files forever.
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        with self._lock:
+            stale = [job for job in self._jobs.values() if job.finished_at is not None and job.finished_at < cutoff]
+            for job in stale:
+                self._jobs.pop(job.job_id, None)
+        for job in stale:
+            if job.result is not None:
+                job.result.cleanup()
+
+    def _finish(self, job: Job, state: str) -> None:
+        job.finished_at = time.time()
+        job.state = state
+        with self._lock:
+            self._futures.pop(job.job_id, None)
+        if job.on_finish is not None:
+            job.on_finish(job)
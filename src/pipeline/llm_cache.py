@@ -0,0 +1,122 @@
+"""Opt-in completion cache for LLM calls with single-flight request coalescing."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Optional
+
+from .constants import LLM_CACHE_MAX_ENTRIES
+
+
+class CompletionCache:
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        *,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        variants_per_key: int = 1,
+    ) -> None:
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.variants_per_key = max(1, variants_per_key)
+        self._memory: OrderedDict[str, list[str]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["CompletionCache"]:
+        directory = os.getenv("LLM_CACHE_DIR")
+        if not directory:
+            return None
+        variants = os.getenv("LLM_CACHE_VARIANTS")
+        return cls(directory, variants_per_key=int(variants) if variants else 1)
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        with self._lock:
+            variants = self._lookup(key)
+            if len(variants) >= self.variants_per_key:
+                return random.choice(variants)
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = Future()
+                self._inflight[key] = inflight
+                is_leader = True
+            else:
+                is_leader = False
+
+        if not is_leader:
+            return inflight.result()
+
+        try:
+            text = compute()
+        except BaseException as exc:
+            inflight.set_exception(exc)
+            raise
+        else:
+            if text:
+                self._store(key, text)
+            inflight.set_result(text)
+            return text
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _lookup(self, key: str) -> list[str]:
+        variants = self._memory.get(key)
+        if variants is not None:
+            self._memory.move_to_end(key)
+            return variants
+
+        if self.directory is None:
+            return []
+        try:
+            data = json.loads((self.directory / f"{key}.json").read_text(encoding="utf-8"))
+            variants = [str(item) for item in data.get("variants", [])]
+        except (OSError, ValueError):
+            return []
+        self._remember(key, variants)
+        return variants
+
+    def _store(self, key: str, text: str) -> None:
+        with self._lock:
+            variants = list(self._lookup(key))
+            if text in variants:
+                return
+            variants = (variants + [text])[-self.variants_per_key:]
+            self._remember(key, variants)
+
+        if self.directory is None:
+            return
+        temp_file = tempfile.NamedTemporaryFile(
+            "w", delete=False, dir=self.directory, suffix=".tmp", encoding="utf-8"
+        )
+        try:
+            with temp_file as fh:
+                json.dump({"variants": variants}, fh, ensure_ascii=False)
+            os.replace(temp_file.name, self.directory / f"{key}.json")
+        except OSError:  # pragma: no cover - disk cache is best effort
+            Path(temp_file.name).unlink(missing_ok=True)
+
+    def _remember(self, key: str, variants: list[str]) -> None:
+        self._memory[key] = variants
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,189 @@
+"""Long-lived pyttsx3 worker process for offline speech synthesis."""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .artifacts import new_scratch_path
+from .constants import PYTTSX3_JOB_TIMEOUT_SECONDS, PYTTSX3_STARTUP_TIMEOUT_SECONDS
+from .errors import ExternalServiceError
+
+_READY = "ready"
+
+
+def select_pyttsx3_voice(engine: Any, language_code: str, vibe_key: str) -> str | None:
+    voices = engine.getProperty("voices")
+    tokens = []
+    if language_code.startswith("es") or vibe_key == "latin radio":
+        tokens = ["es"]
+    elif language_code.startswith("ko"):
+        tokens = ["ko"]
+    elif vibe_key == "british pundit":
+        tokens = ["en-gb", "english"]
+    else:
+        tokens = ["en"]
+
+    for voice in voices:
+        sample = " ".join([
+            voice.id.lower(),
+            voice.name.lower(),
+            " ".join(str(lang).lower() for lang in getattr(voice, "languages", [])),
+        ])
+        if all(token in sample for token in tokens):
+            return voice.id
+    return None
+
+
+def _worker_main(jobs: Any, results: Any) -> None:  # pragma: no cover - runs in the child process
+    try:
+        import pyttsx3  # type: ignore
+
+        engine = pyttsx3.init()
+        # The engine outlives each job, so a job without a matching voice must not inherit the previous one.
+        default_voice = engine.getProperty("voice")
+    except Exception as exc:
+        results.put((_READY, False, repr(exc)))
+        return
+    results.put((_READY, True, None))
+
+    voice_cache: dict[tuple[str, str], str | None] = {}
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        job_id, text, output_path, language_code, vibe_key, rate = job
+        try:
+            cache_key = (language_code, vibe_key)
+            if cache_key not in voice_cache:
+                voice_cache[cache_key] = select_pyttsx3_voice(engine, language_code, vibe_key)
+            engine.setProperty("voice", voice_cache[cache_key] or default_voice)
+            engine.setProperty("rate", rate)
+            engine.setProperty("volume", 1.0)
+            engine.save_to_file(text, output_path)
+            engine.runAndWait()
+            results.put((job_id, True, None))
+        except Exception as exc:
+            results.put((job_id, False, repr(exc)))
+
+
+class Pyttsx3Worker:
+    def __init__(
+        self,
+        *,
+        job_timeout_s: float = PYTTSX3_JOB_TIMEOUT_SECONDS,
+        startup_timeout_s: float = PYTTSX3_STARTUP_TIMEOUT_SECONDS,
+    ) -> None:
+        self.job_timeout_s = job_timeout_s
+        self.startup_timeout_s = startup_timeout_s
+        self._context = multiprocessing.get_context("spawn")
+        self._process: Any = None
+        self._jobs: Any = None
+        self._results: Any = None
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str, *, language_code: str, vibe_key: str, rate: int) -> Path:
+        with self._lock:
+            self._ensure_started()
+            output_path = new_scratch_path(".wav")
+
+            job_id = next(self._job_ids)
+            self._jobs.put((job_id, text, str(output_path), language_code, vibe_key, rate))
+            try:
+                ok, error = self._wait_for(job_id, self.job_timeout_s)
+            except ExternalServiceError:
+                output_path.unlink(missing_ok=True)
+                self._stop_process()
+                raise
+
+            if not ok:
+                output_path.unlink(missing_ok=True)
+                raise ExternalServiceError(
+                    message=f"Local TTS worker failed: {error}",
+                    error_code="pyttsx3_failure",
+                    user_hint="Try switching voice provider."
+                )
+            return output_path
+
+    def start(self) -> None:
+        with self._lock:
+            self._ensure_started()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stop_process()
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        self._stop_process()
+        self._jobs = self._context.Queue()
+        self._results = self._context.Queue()
+        self._process = self._context.Process(
+            target=_worker_main, args=(self._jobs, self._results), name="pyttsx3-worker", daemon=True
+        )
+        self._process.start()
+        try:
+            ok, error = self._wait_for(_READY, self.startup_timeout_s)
+        except ExternalServiceError:
+            self._stop_process()
+            raise
+        if not ok:
+            self._stop_process()
+            raise ExternalServiceError(
+                message=f"Local TTS engine could not start: {error}",
+                error_code="pyttsx3_unavailable",
+                user_hint="Run `pip install pyttsx3` and check a speech engine is installed."
+            )
+
+    def _wait_for(self, job_id: Any, timeout_s: float) -> tuple[bool, str | None]:
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            try:
+                result_id, ok, error = self._results.get(timeout=0.25)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    break
+                continue
+            if result_id == job_id:
+                return ok, error
+        # Hung or crashed engine: the caller restarts the process on the next job.
+        raise ExternalServiceError(
+            message="Local TTS worker did not respond.",
+            error_code="pyttsx3_timeout",
+            user_hint="Retry; the local voice engine is being restarted."
+        )
+
+    def _stop_process(self) -> None:
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._jobs.put_nowait(None)
+            except Exception:  # pragma: no cover - queue already broken
+                pass
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=1)
+        self._process = None
+
+
+_worker: Pyttsx3Worker | None = None
+_worker_lock = threading.Lock()
+
+
+def get_pyttsx3_worker() -> Pyttsx3Worker:
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = Pyttsx3Worker()
+            atexit.register(_worker.shutdown)
+        return _worker
@@ -0,0 +1,188 @@
+"""Per-stage spans for pipeline runs and the sinks that export them."""
+
+from __future__ import annotations
+
+import contextvars
+import dataclasses
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol, Sequence
+
+from .profiling import run_profiled
+
+_OPEN_SPANS: contextvars.ContextVar[dict[str, "StageSpan"]] = contextvars.ContextVar("open_spans", default={})
+
+
+@dataclass
+class StageSpan:
+    stage: str
+    started_at: float = 0.0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    provider: str | None = None
+    retries: int = 0
+    ok: bool = True
+
+
+class SpanRecorder:
+    def __init__(self) -> None:
+        self.spans: list[StageSpan] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[StageSpan]:
+        span = StageSpan(stage=stage, started_at=time.time())
+        token = _OPEN_SPANS.set({**_OPEN_SPANS.get(), stage: span})
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield span
+        except BaseException:
+            span.ok = False
+            raise
+        finally:
+            # thread_time() covers the stage's own thread; subprocesses such as ffmpeg add theirs via record_child_cpu.
+            span.wall_s = time.perf_counter() - wall_start
+            span.cpu_s += time.thread_time() - cpu_start
+            _OPEN_SPANS.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+
+def annotate_span(stage: str, **fields: Any) -> None:
+    span = _OPEN_SPANS.get().get(stage)
+    if span is None:
+        return
+    for name, value in fields.items():
+        setattr(span, name, value)
+
+
+def record_provider(stage: str, provider: str) -> None:
+    span = _OPEN_SPANS.get().get(stage)
+    if span is None:
+        return
+    used = span.provider.split(",") if span.provider else []
+    if provider not in used:
+        span.provider = ",".join([*used, provider])
+
+
+def record_child_cpu(stage: str, seconds: float) -> None:
+    span = _OPEN_SPANS.get().get(stage)
+    if span is not None:
+        span.cpu_s += seconds
+
+
+def record_retry(stage: str) -> None:
+    span = _OPEN_SPANS.get().get(stage)
+    if span is not None:
+        span.retries += 1
+
+
+def bind_run_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    # Worker threads start with an empty context; carry the open spans and any profile capture over.
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return context.copy().run(run_profiled, func, *args, **kwargs)
+
+    return run
+
+
+class MetricsSink(Protocol):
+    def emit(self, spans: Sequence[StageSpan], *, status_notes: Sequence[str]) -> None:
+        ...
+
+
+class JsonlMetricsSink:
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def emit(self, spans: Sequence[StageSpan], *, status_notes: Sequence[str]) -> None:
+        record = {
+            "ts": time.time(),
+            "ok": all(span.ok for span in spans),
+            "status_notes": list(status_notes),
+            "spans": [dataclasses.asdict(span) for span in spans],
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+class PrometheusTextSink:
+    _COUNTERS = (
+        ("commentator_stage_runs_total", "Pipeline stage executions.", lambda span: 1),
+        ("commentator_stage_failures_total", "Pipeline stage executions that raised.", lambda span: int(not span.ok)),
+        ("commentator_stage_wall_seconds_total", "Wall-clock time spent per stage.", lambda span: span.wall_s),
+        ("commentator_stage_cpu_seconds_total", "CPU time spent per stage.", lambda span: span.cpu_s),
+        ("commentator_stage_bytes_read_total", "Bytes read per stage.", lambda span: span.bytes_read),
+        ("commentator_stage_bytes_written_total", "Bytes written per stage.", lambda span: span.bytes_written),
+        ("commentator_stage_retries_total", "Provider retries and fallbacks per stage.", lambda span: span.retries),
+    )
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._totals: dict[tuple[str, str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, spans: Sequence[StageSpan], *, status_notes: Sequence[str]) -> None:
+        with self._lock:
+            for span in spans:
+                for name, _, value in self._COUNTERS:
+                    key = (name, span.stage, span.provider or "")
+                    self._totals[key] = self._totals.get(key, 0.0) + value(span)
+            text = self._render_locked()
+        if self.path is not None:
+            # Written atomically so a textfile collector never scrapes a half-written file.
+            temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            temp_path.write_text(text, encoding="utf-8")
+            os.replace(temp_path, self.path)
+
+    def render(self) -> str:
+        with self._lock:
+            return self._render_locked()
+
+    def _render_locked(self) -> str:
+        lines: list[str] = []
+        for name, help_text, _ in self._COUNTERS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (metric, stage, provider), total in sorted(self._totals.items()):
+                if metric == name:
+                    lines.append(f'{name}{{stage="{stage}",provider="{provider}"}} {total:g}')
+        return "\n".join(lines) + "\n"
+
+
+_default_sinks: list[MetricsSink] | None = None
+_default_sinks_lock = threading.Lock()
+
+
+def default_sinks() -> list[MetricsSink]:
+    global _default_sinks
+    with _default_sinks_lock:
+        if _default_sinks is None:
+            sinks: list[MetricsSink] = []
+            jsonl_path = os.getenv("METRICS_JSONL_PATH")
+            if jsonl_path:
+                sinks.append(JsonlMetricsSink(jsonl_path))
+            prom_path = os.getenv("METRICS_PROM_PATH")
+            if prom_path:
+                sinks.append(PrometheusTextSink(prom_path))
+            _default_sinks = sinks
+        return _default_sinks
+
+
+def emit_spans(sinks: Sequence[MetricsSink], spans: Sequence[StageSpan], status_notes: Sequence[str]) -> None:
+    for sink in sinks:
+        try:
+            sink.emit(spans, status_notes=status_notes)
+        except OSError:  # pragma: no cover - metrics are best effort
+            continue
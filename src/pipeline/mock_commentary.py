@@ -0,0 +1,84 @@
+"""Line templates for the offline mock commentary generator."""
+
+from __future__ import annotations
+
+import random
+import re
+from functools import lru_cache
+
+# Each language is a sequence of slots; one template is picked per slot and the picks are joined with spaces.
+MOCK_COMMENTARY_SLOTS: dict[str, list[list[str]]] = {
+    "en": [
+        [
+            "{team_a} are flying forward, one-touch football shredding the press and the crowd is on its feet!",
+            "Listen to the roar! {team_b} rip through midfield, a give-and-go opens acres of grass and the box is chaos!",
+            "You can feel the electricity! {team_a} sling a whipped cross in, bodies hurling at the near post!",
+        ],
+        [
+            "IT'S A STUNNER THAT RATTLES THE TOP BINS!!!",
+            "GOAL! SENSATIONAL STRIKE, THE NET IS STILL SHAKING!!!",
+            "THE PLACE ERUPTS AS THAT CURLER KISSES THE FAR STANCHION!!!",
+            "WHAT A ROCKET, THE KEEPER'S BEATEN ALL ENDS UP!!!",
+        ],
+        [
+            "The touch, the vision, the finish - that's box-office football!",
+            "This ground is bouncing, you simply cannot script drama like this!",
+            "Championship tempo, heavyweight execution, and the fans are losing their minds!",
+        ],
+    ],
+    "es": [
+        [
+            "{team_a} rompe lineas con puro vértigo, pared y desmarque que enloquecen a la grada!",
+        ],
+        [
+            "GOOOOOOL! Latigazo inapelable que besa la escuadra y hace temblar el estadio!!!",
+            "GOOOOOOL! Disparo teledirigido que besa la escuadra y hace temblar el estadio!!!",
+            "GOOOOOOL! Toque de seda que besa la escuadra y hace temblar el estadio!!!",
+        ],
+    ],
+    "ko": [
+        [
+            "{team_a}의 번개 같은 전진입니다! 패스가 번쩍이며 수비를 찢어 놓고 관중의 함성이 폭발합니다!",
+        ],
+        [
+            "마지막 슛이 골대 상단을 갈라버립니다!!!",
+            "마지막 슛이 골문 구석으로 빨려 들어갑니다!!!",
+            "마지막 슛이 스토퍼를 지나며 그물을 뒤흔듭니다!!!",
+        ],
+    ],
+}
+
+_PLACEHOLDER_RE = re.compile(r"(\{team_a\}|\{team_b\})")
+
+
+def mock_language_key(language: str) -> str:
+    if language.startswith("es"):
+        return "es"
+    if language.startswith("ko"):
+        return "ko"
+    return "en"
+
+
+def render_mock_commentary(language: str, team_a: str, team_b: str) -> str:
+    slots = MOCK_COMMENTARY_SLOTS[mock_language_key(language)]
+    return " ".join(random.choice(templates).format(team_a=team_a, team_b=team_b) for templates in slots)
+
+
+def split_template(template: str) -> list[str]:
+    return [piece.strip() for piece in _PLACEHOLDER_RE.split(template) if piece.strip()]
+
+
+@lru_cache(maxsize=None)
+def template_pattern(template: str) -> re.Pattern[str]:
+    parts: list[str] = []
+    seen: set[str] = set()
+    for piece in split_template(template):
+        name = piece[1:-1] if piece in ("{team_a}", "{team_b}") else None
+        if name is None:
+            parts.append(r"\s+".join(re.escape(word) for word in piece.split()))
+        elif name in seen:
+            parts.append(f"(?P={name})")
+        else:
+            parts.append(f"(?P<{name}>.+?)")
+            seen.add(name)
+    return re.compile(r"\s*" + r"\s*".join(parts))
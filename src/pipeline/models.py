@@ -2,9 +2,26 @@
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, BinaryIO, Iterable, List
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .artifacts import ArtifactStore
+    from .metrics import StageSpan
+
+
+@dataclass
+class MediaInfo:
+    container: str
+    duration_s: float | None = None
+    video_codec: str | None = None
+    width: int | None = None
+    height: int | None = None
+    fps: float | None = None
+    audio_codec: str | None = None
 
 
 @dataclass
@@ -14,8 +31,52 @@ class PipelineResult:
     video_path: Path
     duration_s: float
     status_notes: list[str] = field(default_factory=list)
+    media_info: MediaInfo | None = None
+    artifacts: "ArtifactStore | None" = None
+    spans: "list[StageSpan]" = field(default_factory=list)
+    profile_path: Path | None = None
+    preview_path: Path | None = None
+    pending_video: "Future[Path] | None" = field(default=None, repr=False)
+    render_cancel_event: threading.Event | None = field(default=None, repr=False)
+
+    @property
+    def full_video_ready(self) -> bool:
+        return self.pending_video is None or self.pending_video.done()
+
+    def wait_for_full_video(self, timeout: float | None = None) -> Path:
+        # Until the background render lands, video_path is the preview; a failed render leaves it there.
+        pending = self.pending_video
+        if pending is not None:
+            try:
+                self.video_path = pending.result(timeout=timeout)
+            except FutureTimeoutError:
+                raise
+            except BaseException:
+                self.pending_video = None
+                raise
+            self.pending_video = None
+        return self.video_path
+
+    def open_audio(self) -> BinaryIO:
+        return self.audio_path.open("rb")
+
+    def open_video(self) -> BinaryIO:
+        return self.video_path.open("rb")
 
     def cleanup(self, extra_paths: Iterable[Path] | None = None) -> None:
+        pending = self.pending_video
+        if pending is not None and not pending.done():
+            # The full render still reads from the run's files; drop them once it stops.
+            if self.render_cancel_event is not None:
+                self.render_cancel_event.set()
+            pending.cancel()
+            pending.add_done_callback(lambda _: self._remove_files(extra_paths))
+            return
+        self._remove_files(extra_paths)
+
+    def _remove_files(self, extra_paths: Iterable[Path] | None) -> None:
+        if self.artifacts is not None:
+            self.artifacts.cleanup()
         paths: List[Path] = [self.audio_path, self.video_path]
         if extra_paths:
             paths.extend(list(extra_paths))
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import os
+import re
+import shutil
+import subprocess
 import tempfile
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 try:
     from moviepy.editor import AudioFileClip, VideoFileClip
@@ -12,29 +17,247 @@ except ImportError:  # moviepy>=2.0 namespace
     from moviepy.audio.io.AudioFileClip import AudioFileClip
     from moviepy.video.io.VideoFileClip import VideoFileClip
 
-from .constants import STATUS_TRIMMED_AUDIO
-from .errors import MuxingError
+from .artifacts import new_scratch_path
+from .constants import (
+    DEFAULT_MUX_BACKEND,
+    MP4_COPY_VIDEO_CODECS,
+    PREVIEW_AUDIO_BITRATE,
+    PREVIEW_CRF,
+    PREVIEW_MAX_HEIGHT,
+    STAGE_MUX,
+    STATUS_TRIMMED_AUDIO,
+)
+from .errors import CancellationError, MuxingError
+from .metrics import record_child_cpu, record_provider, record_retry
+from .models import MediaInfo
 
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_CODEC_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+)")
 
-def mux_audio_with_video(video_path: Path, audio_path: Path) -> Tuple[Path, list[str]]:
-    output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-    output_path = Path(output_file.name)
-    output_file.close()
 
+def mux_audio_with_video(
+    video_path: Path,
+    audio_path: Path,
+    *,
+    backend: str | None = None,
+    video_info: MediaInfo | None = None,
+    audio_duration_s: float | None = None,
+    output_path: Path | None = None,
+    cancel_event: Optional[threading.Event] = None,
+    preview: bool = False,
+) -> Tuple[Path, list[str]]:
+    output_path = output_path or new_scratch_path(".mp4")
+    ffmpeg_binary = _select_ffmpeg(backend)
+    if ffmpeg_binary is not None:
+        return _mux_with_ffmpeg(
+            ffmpeg_binary, video_path, audio_path, output_path, video_info, audio_duration_s, cancel_event, preview
+        )
+    return _mux_with_moviepy(video_path, audio_path, output_path, video_info, audio_duration_s, preview)
+
+
+def is_stream_copy(video_info: MediaInfo | None, *, backend: str | None = None) -> bool:
+    # A copied video stream renders in about the time a preview would take, so no preview is needed.
+    return (
+        video_info is not None
+        and video_info.video_codec in MP4_COPY_VIDEO_CODECS
+        and _select_ffmpeg(backend) is not None
+    )
+
+
+def _select_ffmpeg(backend: str | None) -> str | None:
+    backend_key = (backend or os.getenv("MUX_BACKEND") or DEFAULT_MUX_BACKEND).lower()
+    return resolve_ffmpeg_binary() if backend_key == "ffmpeg" else None
+
+
+def resolve_ffmpeg_binary() -> str | None:
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+    try:  # pragma: no cover - optional dependency shipped with moviepy
+        import imageio_ffmpeg  # type: ignore
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:  # pragma: no cover - no usable ffmpeg
+        return None
+
+
+def _probe_with_ffmpeg(ffmpeg_binary: str, media_path: Path) -> Tuple[float | None, str | None]:
+    completed = subprocess.run(
+        [ffmpeg_binary, "-hide_banner", "-i", str(media_path)],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    duration: float | None = None
+    match = _DURATION_RE.search(completed.stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    codec_match = _VIDEO_CODEC_RE.search(completed.stderr)
+    video_codec = codec_match.group(1).lower() if codec_match else None
+    return duration, video_codec
+
+
+def _ffmpeg_video_args(video_codec: str | None) -> list[str]:
+    if video_codec in MP4_COPY_VIDEO_CODECS:
+        args = ["-c:v", "copy"]
+        if video_codec == "hevc":
+            args += ["-tag:v", "hvc1"]
+        return args
+    return ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"]
+
+
+def _ffmpeg_preview_args() -> list[str]:
+    return [
+        "-c:v",
+        "libx264",
+        "-preset",
+        "ultrafast",
+        "-tune",
+        "fastdecode",
+        "-crf",
+        str(PREVIEW_CRF),
+        "-pix_fmt",
+        "yuv420p",
+        "-threads",
+        "0",
+        "-vf",
+        _preview_scale_filter(),
+    ]
+
+
+def _preview_scale_filter() -> str:
+    return f"scale=-2:'min({PREVIEW_MAX_HEIGHT},ih)'"
+
+
+def _run_ffmpeg(cmd: list[str], cancel_event: Optional[threading.Event]) -> None:
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=stderr_file)
+        while not _reap_ffmpeg(process, block=cancel_event is None):
+            if not cancel_event.wait(0.25):
+                continue
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            raise CancellationError(
+                message="Generation was cancelled.",
+                error_code="cancelled",
+                user_hint="Start a new generation when ready."
+            )
+        if process.returncode:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr_file.read())
+
+
+def _reap_ffmpeg(process: subprocess.Popen, *, block: bool) -> bool:
+    # wait4 reports this ffmpeg's own CPU time, unlike the process-wide children counters.
+    if not hasattr(os, "wait4"):  # pragma: no cover - Windows
+        if block:
+            process.wait()
+        return process.poll() is not None
+    pid, status, usage = os.wait4(process.pid, 0 if block else os.WNOHANG)
+    if pid == 0:
+        return False
+    process.returncode = os.waitstatus_to_exitcode(status)
+    record_child_cpu(STAGE_MUX, usage.ru_utime + usage.ru_stime)
+    return True
+
+
+def _mux_with_ffmpeg(
+    ffmpeg_binary: str,
+    video_path: Path,
+    audio_path: Path,
+    output_path: Path,
+    video_info: MediaInfo | None,
+    audio_duration: float | None,
+    cancel_event: Optional[threading.Event] = None,
+    preview: bool = False,
+) -> Tuple[Path, list[str]]:
+    notes: list[str] = []
+    record_provider(STAGE_MUX, "ffmpeg")
+
+    try:
+        if video_info is not None and video_info.duration_s and video_info.video_codec:
+            video_duration, video_codec = video_info.duration_s, video_info.video_codec
+        else:
+            video_duration, video_codec = _probe_with_ffmpeg(ffmpeg_binary, video_path)
+        if audio_duration is None:
+            audio_duration, _ = _probe_with_ffmpeg(ffmpeg_binary, audio_path)
+
+        base_cmd = [
+            ffmpeg_binary,
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            str(video_path),
+            "-i",
+            str(audio_path),
+            "-map",
+            "0:v:0",
+            "-map",
+            "1:a:0",
+        ]
+        tail_cmd = ["-c:a", "aac", "-b:a", PREVIEW_AUDIO_BITRATE if preview else "160k"]
+        if video_duration:
+            tail_cmd += ["-t", f"{video_duration:.3f}"]
+        tail_cmd += ["-movflags", "+faststart", str(output_path)]
+
+        video_args = _ffmpeg_preview_args() if preview else _ffmpeg_video_args(video_codec)
+        try:
+            _run_ffmpeg(base_cmd + video_args + tail_cmd, cancel_event)
+        except subprocess.CalledProcessError:
+            if video_args[1] != "copy":
+                raise
+            # Some containers carry timestamps MP4 cannot hold; re-encode instead.
+            record_retry(STAGE_MUX)
+            _run_ffmpeg(base_cmd + _ffmpeg_video_args(None) + tail_cmd, cancel_event)
+
+        if audio_duration and video_duration and audio_duration > video_duration:
+            notes.append(STATUS_TRIMMED_AUDIO)
+        return output_path, notes
+    except CancellationError:
+        output_path.unlink(missing_ok=True)
+        raise
+    except Exception as exc:  # pragma: no cover - external dependency
+        output_path.unlink(missing_ok=True)
+        raise MuxingError(
+            message="Could not mux audio and video.",
+            error_code="mux_failure",
+            user_hint="Ensure ffmpeg is installed and retry."
+        ) from exc
+
+
+def _mux_with_moviepy(
+    video_path: Path,
+    audio_path: Path,
+    output_path: Path,
+    video_info: MediaInfo | None,
+    audio_duration: float | None,
+    preview: bool = False,
+) -> Tuple[Path, list[str]]:
     video_clip: VideoFileClip | None = None
     audio_clip: AudioFileClip | None = None
     notes: list[str] = []
+    record_provider(STAGE_MUX, "moviepy")
 
     try:
         video_clip = VideoFileClip(str(video_path))
         audio_clip = AudioFileClip(str(audio_path))
 
+        video_duration = (video_info.duration_s if video_info else None) or video_clip.duration
+        audio_duration = audio_duration or audio_clip.duration
+
         trimmed = False
-        if audio_clip.duration and video_clip.duration and audio_clip.duration > video_clip.duration:
+        if audio_duration and video_duration and audio_duration > video_duration:
             if hasattr(audio_clip, "subclip"):
-                audio_clip = audio_clip.subclip(0, video_clip.duration)
+                audio_clip = audio_clip.subclip(0, video_duration)
             else:
-                audio_clip = audio_clip.subclipped(0, video_clip.duration)
+                audio_clip = audio_clip.subclipped(0, video_duration)
             trimmed = True
 
         if hasattr(video_clip, "set_audio"):
@@ -42,8 +265,15 @@ def mux_audio_with_video(video_path: Path, audio_path: Path) -> Tuple[Path, list
         else:
             result_clip = video_clip.with_audio(audio_clip)
 
-        fps = video_clip.fps or 30
+        fps = (video_info.fps if video_info else None) or video_clip.fps or 30
         write_kwargs = {"codec": "libx264", "audio_codec": "aac", "fps": fps}
+        if preview:
+            write_kwargs.update(
+                preset="ultrafast",
+                threads=os.cpu_count(),
+                audio_bitrate=PREVIEW_AUDIO_BITRATE,
+                ffmpeg_params=["-crf", str(PREVIEW_CRF), "-vf", _preview_scale_filter()],
+            )
         result_clip.write_videofile(str(output_path), **write_kwargs)
 
         if trimmed:
@@ -0,0 +1,442 @@
+"""Header-only media probing for MP4/MOV and WebM/Matroska containers."""
+
+from __future__ import annotations
+
+import struct
+import wave
+from pathlib import Path
+from typing import BinaryIO, Iterator, Tuple
+
+try:
+    from moviepy.editor import VideoFileClip
+except ImportError:  # moviepy>=2.0 namespace
+    from moviepy.video.io.VideoFileClip import VideoFileClip
+
+from .errors import ValidationError
+from .models import MediaInfo
+
+_MP4_TOP_LEVEL_BOXES = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot", b"uuid"}
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+_MAX_HEADER_BYTES = 32 * 1024 * 1024
+
+_MP4_CODECS = {
+    "avc1": "h264",
+    "avc3": "h264",
+    "hvc1": "hevc",
+    "hev1": "hevc",
+    "mp4v": "mpeg4",
+    "av01": "av1",
+    "vp09": "vp9",
+    "mp4a": "aac",
+    "ac-3": "ac3",
+    "opus": "opus",
+    "apch": "prores",
+    "apcn": "prores",
+    "apcs": "prores",
+    "apco": "prores",
+}
+
+_MATROSKA_CODECS = {
+    "V_VP8": "vp8",
+    "V_VP9": "vp9",
+    "V_AV1": "av1",
+    "V_MPEG4/ISO/AVC": "h264",
+    "V_MPEGH/ISO/HEVC": "hevc",
+    "A_OPUS": "opus",
+    "A_VORBIS": "vorbis",
+    "A_AAC": "aac",
+}
+
+# Matroska element IDs (marker bits kept, as written in the spec).
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TRACKS = 0x1654AE6B
+_EBML_CLUSTER = 0x1F43B675
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_TRACK_ENTRY = 0xAE
+_EBML_TRACK_TYPE = 0x83
+_EBML_CODEC_ID = 0x86
+_EBML_DEFAULT_DURATION = 0x23E383
+_EBML_VIDEO = 0xE0
+_EBML_PIXEL_WIDTH = 0xB0
+_EBML_PIXEL_HEIGHT = 0xBA
+
+
+def sniff_container(video_path: Path) -> str | None:
+    try:
+        with video_path.open("rb") as fh:
+            head = fh.read(8)
+    except OSError:
+        return None
+    if head[:4] == _EBML_MAGIC:
+        return "webm"
+    if len(head) == 8 and head[4:8] in _MP4_TOP_LEVEL_BOXES:
+        return "mp4"
+    return None
+
+
+def probe_video(video_path: Path) -> MediaInfo:
+    container = sniff_container(video_path)
+    if container is None:
+        raise ValidationError(
+            message="Unrecognised video container.",
+            error_code="invalid_video",
+            user_hint="Ensure the file is a playable mp4/mov/webm clip."
+        )
+
+    media_info = probe_container(video_path)
+    if media_info is not None and media_info.duration_s:
+        return media_info
+
+    clip: VideoFileClip | None = None
+    try:
+        clip = VideoFileClip(str(video_path))
+        fallback = MediaInfo(
+            container=container,
+            duration_s=float(clip.duration or 0.0),
+            fps=float(clip.fps) if clip.fps else None,
+            width=int(clip.size[0]) if clip.size else None,
+            height=int(clip.size[1]) if clip.size else None,
+        )
+    except OSError as exc:
+        raise ValidationError(
+            message="Unable to read video duration.",
+            error_code="invalid_video",
+            user_hint="Ensure the file is a playable mp4/mov/webm clip."
+        ) from exc
+    finally:
+        if clip is not None:
+            clip.close()
+
+    if media_info is not None:
+        fallback.video_codec = media_info.video_codec
+        fallback.audio_codec = media_info.audio_codec
+    return fallback
+
+
+def probe_container(video_path: Path) -> MediaInfo | None:
+    container = sniff_container(video_path)
+    try:
+        with video_path.open("rb") as fh:
+            if container == "mp4":
+                return _probe_mp4(fh)
+            if container == "webm":
+                return _probe_matroska(fh)
+    except (OSError, ValueError, IndexError, EOFError, struct.error):
+        return None
+    return None
+
+
+def probe_audio_duration(audio_path: Path) -> float | None:
+    try:
+        if audio_path.suffix.lower() == ".wav":
+            with wave.open(str(audio_path), "rb") as wav_file:
+                frame_rate = wav_file.getframerate()
+                return wav_file.getnframes() / frame_rate if frame_rate else None
+        with audio_path.open("rb") as fh:
+            return _probe_mp3_duration(fh)
+    except (OSError, EOFError, wave.Error, IndexError, struct.error):
+        return None
+
+
+# --- MP3 -------------------------------------------------------------------
+
+_MP3_BITRATES_V1_L3 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+_MP3_BITRATES_V2_L3 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _probe_mp3_duration(fh: BinaryIO) -> float | None:
+    fh.seek(0, 2)
+    file_size = fh.tell()
+    fh.seek(0)
+    head = fh.read(10)
+    audio_start = 0
+    if head[:3] == b"ID3":
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        audio_start = 10 + tag_size
+
+    fh.seek(audio_start)
+    window = fh.read(64 * 1024)
+    offset = 0
+    while offset + 4 <= len(window):
+        if window[offset] == 0xFF and window[offset + 1] & 0xE0 == 0xE0:
+            version = (window[offset + 1] >> 3) & 0x03
+            layer = (window[offset + 1] >> 1) & 0x03
+            bitrate_index = window[offset + 2] >> 4
+            rate_index = (window[offset + 2] >> 2) & 0x03
+            if version != 1 and layer == 1 and 0 < bitrate_index < 15 and rate_index < 3:
+                break
+        offset += 1
+    else:
+        return None
+
+    header = window[offset:offset + 4]
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    samples_per_frame = 1152 if version == 3 else 576
+    mono = (header[3] >> 6) == 3
+    if version == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+
+    xing_offset = offset + 4 + side_info
+    if window[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+        (flags,) = struct.unpack_from(">I", window, xing_offset + 4)
+        if flags & 0x01:
+            (frames,) = struct.unpack_from(">I", window, xing_offset + 8)
+            return frames * samples_per_frame / sample_rate
+
+    bitrates = _MP3_BITRATES_V1_L3 if version == 3 else _MP3_BITRATES_V2_L3
+    bitrate = bitrates[bitrate_index] * 1000
+    return (file_size - audio_start - offset) * 8 / bitrate
+
+
+# --- MP4 / QuickTime -------------------------------------------------------
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: int | None = None) -> Iterator[Tuple[bytes, int, int]]:
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _find_child(data: bytes, start: int, end: int, box_type: bytes) -> Tuple[int, int] | None:
+    for child_type, child_start, child_end in _iter_boxes(data, start, end):
+        if child_type == box_type:
+            return child_start, child_end
+    return None
+
+
+def _read_moov(fh: BinaryIO) -> bytes | None:
+    fh.seek(0, 2)
+    file_size = fh.tell()
+    offset = 0
+    while offset + 8 <= file_size:
+        fh.seek(offset)
+        header = fh.read(16)
+        size, box_type = struct.unpack_from(">I4s", header, 0)
+        header_len = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", header, 8)[0]
+            header_len = 16
+        elif size == 0:
+            size = file_size - offset
+        if size < header_len:
+            return None
+        if box_type == b"moov":
+            if size > _MAX_HEADER_BYTES:
+                return None
+            fh.seek(offset + header_len)
+            return fh.read(size - header_len)
+        offset += size
+    return None
+
+
+def _parse_full_box_times(data: bytes, start: int) -> Tuple[int, int]:
+    version = data[start]
+    if version == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, start + 4 + 16)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, start + 4 + 8)
+    return timescale, duration
+
+
+def _probe_mp4(fh: BinaryIO) -> MediaInfo | None:
+    moov = _read_moov(fh)
+    if moov is None:
+        return None
+
+    info = MediaInfo(container="mp4")
+    mvhd = _find_child(moov, 0, len(moov), b"mvhd")
+    if mvhd is not None:
+        timescale, duration = _parse_full_box_times(moov, mvhd[0])
+        if timescale and duration and duration not in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+            info.duration_s = duration / timescale
+
+    for box_type, trak_start, trak_end in _iter_boxes(moov):
+        if box_type != b"trak":
+            continue
+        mdia = _find_child(moov, trak_start, trak_end, b"mdia")
+        if mdia is None:
+            continue
+        hdlr = _find_child(moov, mdia[0], mdia[1], b"hdlr")
+        mdhd = _find_child(moov, mdia[0], mdia[1], b"mdhd")
+        minf = _find_child(moov, mdia[0], mdia[1], b"minf")
+        stbl = _find_child(moov, minf[0], minf[1], b"stbl") if minf else None
+        stsd = _find_child(moov, stbl[0], stbl[1], b"stsd") if stbl else None
+        if hdlr is None or stsd is None:
+            continue
+
+        handler = moov[hdlr[0] + 8:hdlr[0] + 12]
+        fourcc = moov[stsd[0] + 12:stsd[0] + 16].decode("latin-1")
+        codec = _MP4_CODECS.get(fourcc, fourcc.strip() or None)
+
+        if handler == b"vide" and info.video_codec is None:
+            info.video_codec = codec
+            entry_start = stsd[0] + 8
+            info.width, info.height = struct.unpack_from(">HH", moov, entry_start + 32)
+            stts = _find_child(moov, stbl[0], stbl[1], b"stts")
+            if stts is not None and mdhd is not None:
+                timescale, _ = _parse_full_box_times(moov, mdhd[0])
+                info.fps = _fps_from_stts(moov, stts[0], timescale)
+        elif handler == b"soun" and info.audio_codec is None:
+            info.audio_codec = codec
+
+    return info
+
+
+def _fps_from_stts(data: bytes, start: int, timescale: int) -> float | None:
+    (entry_count,) = struct.unpack_from(">I", data, start + 4)
+    total_samples = 0
+    total_delta = 0
+    for index in range(entry_count):
+        count, delta = struct.unpack_from(">II", data, start + 8 + index * 8)
+        total_samples += count
+        total_delta += count * delta
+    if not total_samples or not total_delta or not timescale:
+        return None
+    return round(total_samples * timescale / total_delta, 3)
+
+
+# --- WebM / Matroska -------------------------------------------------------
+
+
+def _read_vint(data: bytes, offset: int, *, keep_marker: bool) -> Tuple[int | None, int]:
+    first = data[offset]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("Invalid EBML variable-length integer")
+    value = first if keep_marker else first & (mask - 1)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, length  # unknown size
+    return value, length
+
+
+def _iter_ebml(data: bytes, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    offset = start
+    while offset < end:
+        element_id, id_len = _read_vint(data, offset, keep_marker=True)
+        size, size_len = _read_vint(data, offset + id_len, keep_marker=False)
+        payload_start = offset + id_len + size_len
+        payload_end = end if size is None else min(payload_start + size, end)
+        yield int(element_id or 0), payload_start, payload_end
+        offset = payload_end
+
+
+def _ebml_uint(data: bytes, start: int, end: int) -> int:
+    return int.from_bytes(data[start:end], "big")
+
+
+def _ebml_float(data: bytes, start: int, end: int) -> float:
+    if end - start == 4:
+        return struct.unpack(">f", data[start:end])[0]
+    return struct.unpack(">d", data[start:end])[0]
+
+
+def _read_ebml_header(fh: BinaryIO) -> Tuple[int, int | None, int]:
+    head = fh.read(12)
+    if not head:
+        raise EOFError
+    element_id, id_len = _read_vint(head, 0, keep_marker=True)
+    size, size_len = _read_vint(head, id_len, keep_marker=False)
+    return int(element_id or 0), size, id_len + size_len
+
+
+def _probe_matroska(fh: BinaryIO) -> MediaInfo | None:
+    fh.seek(0, 2)
+    file_size = fh.tell()
+
+    fh.seek(0)
+    _, header_size, header_len = _read_ebml_header(fh)
+    offset = header_len + (header_size or 0)
+
+    fh.seek(offset)
+    segment_id, segment_size, segment_header_len = _read_ebml_header(fh)
+    if segment_id != _EBML_SEGMENT:
+        return None
+    offset += segment_header_len
+    segment_end = file_size if segment_size is None else min(offset + segment_size, file_size)
+
+    info = MediaInfo(container="webm")
+    timecode_scale = 1_000_000
+    raw_duration: float | None = None
+    seen_info = seen_tracks = False
+
+    while offset < segment_end and not (seen_info and seen_tracks):
+        fh.seek(offset)
+        try:
+            element_id, size, header_len = _read_ebml_header(fh)
+        except EOFError:
+            break
+        if element_id == _EBML_CLUSTER or size is None:
+            break
+        payload_start = offset + header_len
+        if element_id in (_EBML_INFO, _EBML_TRACKS) and size <= _MAX_HEADER_BYTES:
+            fh.seek(payload_start)
+            payload = fh.read(size)
+            if element_id == _EBML_INFO:
+                seen_info = True
+                for child_id, child_start, child_end in _iter_ebml(payload, 0, len(payload)):
+                    if child_id == _EBML_TIMECODE_SCALE:
+                        timecode_scale = _ebml_uint(payload, child_start, child_end)
+                    elif child_id == _EBML_DURATION:
+                        raw_duration = _ebml_float(payload, child_start, child_end)
+            else:
+                seen_tracks = True
+                _parse_matroska_tracks(payload, info)
+        offset = payload_start + size
+
+    if raw_duration:
+        info.duration_s = raw_duration * timecode_scale / 1_000_000_000
+    return info
+
+
+def _parse_matroska_tracks(payload: bytes, info: MediaInfo) -> None:
+    for entry_id, entry_start, entry_end in _iter_ebml(payload, 0, len(payload)):
+        if entry_id != _EBML_TRACK_ENTRY:
+            continue
+        track_type = 0
+        codec_id = ""
+        default_duration = 0
+        width = height = None
+        for child_id, child_start, child_end in _iter_ebml(payload, entry_start, entry_end):
+            if child_id == _EBML_TRACK_TYPE:
+                track_type = _ebml_uint(payload, child_start, child_end)
+            elif child_id == _EBML_CODEC_ID:
+                codec_id = payload[child_start:child_end].rstrip(b"\x00").decode("ascii", "replace")
+            elif child_id == _EBML_DEFAULT_DURATION:
+                default_duration = _ebml_uint(payload, child_start, child_end)
+            elif child_id == _EBML_VIDEO:
+                for video_id, video_start, video_end in _iter_ebml(payload, child_start, child_end):
+                    if video_id == _EBML_PIXEL_WIDTH:
+                        width = _ebml_uint(payload, video_start, video_end)
+                    elif video_id == _EBML_PIXEL_HEIGHT:
+                        height = _ebml_uint(payload, video_start, video_end)
+
+        codec = _MATROSKA_CODECS.get(codec_id, codec_id.lower() or None)
+        if track_type == 1 and info.video_codec is None:
+            info.video_codec = codec
+            info.width, info.height = width, height
+            if default_duration:
+                info.fps = round(1_000_000_000 / default_duration, 3)
+        elif track_type == 2 and info.audio_codec is None:
+            info.audio_codec = codec
@@ -2,53 +2,151 @@
 
 from __future__ import annotations
 
-import tempfile
+import dataclasses
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Sequence, Tuple
 
-from .errors import ExternalServiceError, MuxingError, PipelineError, ValidationError
+from .artifacts import Artifact, ArtifactStore
+from .audio_fit import fit_audio
+from .cache import ResultCache
+from .constants import MAX_VIDEO_MB, RENDER_WORKERS, STAGE_AUDIO, STAGE_LLM, STAGE_MUX, STAGE_TTS, STAGE_VALIDATE
+from .errors import CancellationError, ExternalServiceError, MuxingError, PipelineError, ValidationError
 from .llm import LLMClient
-from .models import PipelineResult
-from .mux import mux_audio_with_video
+from .metrics import MetricsSink, SpanRecorder, StageSpan, bind_run_context, default_sinks, emit_spans
+from .models import MediaInfo, PipelineResult
+from .mux import is_stream_copy, mux_audio_with_video
+from .probe import probe_audio_duration, probe_video
+from .profiling import profile_run
 from .prompting import PromptContext, build_prompt
+from .streaming import stream_commentary
 from .tts import TTSService
-from .validators import validate_upload
+from .validators import validate_duration, validate_extension, validate_filesize
 
 
-def generate_commentated_clip(
-    *,
-    video_bytes: bytes,
-    filename: str,
-    vibe: str,
-    team_a: str | None,
-    team_b: str | None,
-    key_moments: str | None,
-    language: str | None,
-    tts_provider: str | None,
-    llm_client: Optional[LLMClient] = None,
-    tts_service: Optional[TTSService] = None,
-) -> PipelineResult:
-    temp_video = tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix or ".mp4")
-    temp_video_path = Path(temp_video.name)
-    with temp_video:
-        temp_video.write(video_bytes)
+StageCallback = Callable[[str, str], None]
+
+_render_pool: ThreadPoolExecutor | None = None
+_render_pool_lock = threading.Lock()
 
-    llm_client = llm_client or LLMClient()
-    tts_service = tts_service or TTSService()
 
-    audio_path: Path | None = None
-    final_video_path: Path | None = None
+def _notify(on_stage: Optional[StageCallback], stage: str, status: str) -> None:
+    if on_stage is not None:
+        on_stage(stage, status)
 
+
+@contextmanager
+def _stage(recorder: SpanRecorder, on_stage: Optional[StageCallback], stage: str) -> Iterator[StageSpan]:
+    _notify(on_stage, stage, "started")
     try:
-        duration_s = validate_upload(filename, len(video_bytes), temp_video_path)
-        prompt_ctx: PromptContext = build_prompt(
-            vibe=vibe,
-            team_a=team_a,
-            team_b=team_b,
-            key_moments=key_moments,
-            language=language,
+        with recorder.span(stage) as span:
+            yield span
+    except BaseException:
+        _notify(on_stage, stage, "failed")
+        raise
+    _notify(on_stage, stage, "finished")
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise CancellationError(
+            message="Generation was cancelled.",
+            error_code="cancelled",
+            user_hint="Start a new generation when ready."
         )
 
+
+def _await(future: Future, cancel_event: Optional[threading.Event]) -> Any:
+    if cancel_event is None:
+        return future.result()
+    while True:
+        try:
+            return future.result(timeout=0.25)
+        except FutureTimeoutError:
+            _check_cancelled(cancel_event)
+
+
+def _stream_remaining(stream: BinaryIO) -> int | None:
+    try:
+        if stream.seekable():
+            position = stream.tell()
+            end = stream.seek(0, os.SEEK_END)
+            stream.seek(position)
+            return end - position
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def _ingest_video(
+    artifacts: ArtifactStore,
+    suffix: str,
+    video_bytes: bytes | None,
+    video_path: Path | str | None,
+    video_stream: BinaryIO | None,
+) -> Artifact:
+    if sum(source is not None for source in (video_bytes, video_path, video_stream)) != 1:
+        raise ValueError("Pass exactly one of video_bytes, video_path or video_stream.")
+
+    if video_path is not None:
+        video_path = Path(video_path)
+        try:
+            num_bytes = video_path.stat().st_size
+        except OSError as exc:
+            raise ValidationError(
+                message="Video file could not be read.",
+                error_code="invalid_video",
+                user_hint="Check the clip path and retry."
+            ) from exc
+        validate_filesize(num_bytes)
+        return artifacts.reference(video_path)
+
+    if video_bytes is not None:
+        validate_filesize(len(video_bytes))
+        return artifacts.put_bytes(video_bytes, suffix=suffix)
+
+    remaining = _stream_remaining(video_stream)
+    if remaining is not None:
+        validate_filesize(remaining)
+    # Read one byte past the limit so an oversized stream is rejected without copying all of it.
+    artifact = artifacts.put_stream(video_stream, suffix=suffix, limit=MAX_VIDEO_MB * 1024 * 1024 + 1)
+    validate_filesize(artifact.size)
+    return artifact
+
+
+def _probe_and_validate(
+    video_path: Path,
+    recorder: SpanRecorder,
+    on_stage: Optional[StageCallback],
+) -> Tuple[MediaInfo, float]:
+    with _stage(recorder, on_stage, STAGE_VALIDATE) as span:
+        span.bytes_read = video_path.stat().st_size
+        media_info = probe_video(video_path)
+        duration_s = validate_duration(video_path, media_info)
+    return media_info, duration_s
+
+
+def _generate_speech(
+    llm_client: LLMClient,
+    tts_service: TTSService,
+    prompt_ctx: PromptContext,
+    tts_provider: str | None,
+    stream_tts: bool,
+    recorder: SpanRecorder,
+    on_stage: Optional[StageCallback],
+) -> Tuple[str, Path, list[str]]:
+    if stream_tts:
+        # Streaming interleaves both stages, so their spans cover the same interval.
+        with _stage(recorder, on_stage, STAGE_LLM), _stage(recorder, on_stage, STAGE_TTS) as span:
+            speech = stream_commentary(llm_client, tts_service, prompt_ctx, tts_provider)
+            span.bytes_written = speech[1].stat().st_size
+        return speech
+
+    with _stage(recorder, on_stage, STAGE_LLM):
         commentary_text, llm_notes = llm_client.generate(prompt_ctx.prompt, language=prompt_ctx.language)
         if not commentary_text:
             raise PipelineError(
@@ -57,29 +155,223 @@ def generate_commentated_clip(
                 user_hint="Retry with more context."
             )
 
+    with _stage(recorder, on_stage, STAGE_TTS) as span:
         audio_path, tts_notes = tts_service.synthesize(
             commentary_text,
             provider=tts_provider,
             language=prompt_ctx.language,
             voice_hint=prompt_ctx.vibe_key,
         )
+        span.bytes_written = audio_path.stat().st_size
+    return commentary_text, audio_path, llm_notes + tts_notes
+
+
+def _discard_speech(future: Future) -> None:
+    if future.cancel():
+        return
+
+    def _cleanup(done: Future) -> None:
+        if done.cancelled() or done.exception() is not None:
+            return
+        _, audio_path, _ = done.result()
+        audio_path.unlink(missing_ok=True)
+
+    future.add_done_callback(_cleanup)
+
+
+def _render_executor() -> ThreadPoolExecutor:
+    # Full-quality renders outlive their job, so they share one bounded pool instead of bypassing JOB_WORKERS.
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            workers = int(os.getenv("RENDER_WORKERS") or RENDER_WORKERS)
+            _render_pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="commentator-render")
+        return _render_pool
+
+
+def _render_full_video(
+    video_artifact: Artifact,
+    audio_path: Path,
+    media_info: MediaInfo,
+    audio_duration_s: float | None,
+    output_path: Path,
+    cancel_event: threading.Event,
+) -> Path:
+    try:
+        _check_cancelled(cancel_event)
+        final_video_path, _ = mux_audio_with_video(
+            video_artifact.path,
+            audio_path,
+            video_info=media_info,
+            audio_duration_s=audio_duration_s,
+            output_path=output_path,
+            cancel_event=cancel_event,
+        )
+        return final_video_path
+    finally:
+        video_artifact.discard()
+
+
+def _cache_full_render(result_cache: ResultCache, cache_key: str, result: PipelineResult, future: Future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    result_cache.put(cache_key, dataclasses.replace(result, video_path=future.result(), pending_video=None))
+
+
+def _run_pipeline(
+    *,
+    video_bytes: bytes | None = None,
+    video_path: Path | str | None = None,
+    video_stream: BinaryIO | None = None,
+    filename: str,
+    vibe: str,
+    team_a: str | None,
+    team_b: str | None,
+    key_moments: str | None,
+    language: str | None,
+    tts_provider: str | None,
+    llm_client: Optional[LLMClient] = None,
+    tts_service: Optional[TTSService] = None,
+    result_cache: Optional[ResultCache] = None,
+    stream_tts: bool | None = None,
+    on_stage: Optional[StageCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+    metrics_sinks: Optional[Sequence[MetricsSink]] = None,
+    preview_first: bool = False,
+) -> PipelineResult:
+    validate_extension(filename)
+    artifacts = ArtifactStore()
+    try:
+        video_artifact = _ingest_video(
+            artifacts, Path(filename).suffix.lower() or ".mp4", video_bytes, video_path, video_stream
+        )
+    except BaseException:
+        artifacts.cleanup()
+        raise
+
+    tts_service = tts_service or TTSService()
+    prompt_ctx: PromptContext = build_prompt(
+        vibe=vibe,
+        team_a=team_a,
+        team_b=team_b,
+        key_moments=key_moments,
+        language=language,
+    )
+
+    result_cache = result_cache or ResultCache.from_env()
+    cache_key: str | None = None
+    if result_cache is not None:
+        provider_key = (tts_provider or tts_service.default_provider).strip().lower()
+        with video_artifact.view() as video_data:
+            cache_key = ResultCache.make_key(video_data, prompt_ctx, provider_key)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            artifacts.cleanup()
+            return cached
+
+    temp_video_path = video_artifact.path
+
+    llm_client = llm_client or LLMClient()
+    if stream_tts is None:
+        stream_tts = os.getenv("STREAM_TTS", "").lower() in {"1", "true", "yes"}
+
+    recorder = SpanRecorder()
+    result: PipelineResult | None = None
+    pending_video: Future | None = None
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="commentator")
+
+    try:
+        # The LLM and TTS stages only need the prompt, so they run while the upload is probed.
+        validation_future = executor.submit(
+            bind_run_context(_probe_and_validate), temp_video_path, recorder, on_stage
+        )
+        speech_future = executor.submit(
+            bind_run_context(_generate_speech),
+            llm_client,
+            tts_service,
+            prompt_ctx,
+            tts_provider,
+            stream_tts,
+            recorder,
+            on_stage,
+        )
+        try:
+            media_info, duration_s = _await(validation_future, cancel_event)
+            commentary_text, audio_path, speech_notes = _await(speech_future, cancel_event)
+        except BaseException:
+            _discard_speech(speech_future)
+            raise
+        speech_artifact = artifacts.adopt(audio_path)
+
+        _check_cancelled(cancel_event)
+        with _stage(recorder, on_stage, STAGE_AUDIO) as span:
+            span.bytes_read = audio_path.stat().st_size
+            fitted_path, audio_duration_s, fit_notes = fit_audio(audio_path, duration_s)
+            span.bytes_written = fitted_path.stat().st_size if fitted_path != audio_path else 0
+        if fitted_path != audio_path:
+            artifacts.adopt(fitted_path)
+            speech_artifact.discard()
+            audio_path = fitted_path
+        if audio_duration_s is None:
+            audio_duration_s = probe_audio_duration(audio_path)
 
-        final_video_path, mux_notes = mux_audio_with_video(temp_video_path, audio_path)
-        temp_video_path.unlink(missing_ok=True)
+        _check_cancelled(cancel_event)
+        # A re-encode is slow, so a small preview is rendered first and the full encode follows in the background.
+        preview = preview_first and not is_stream_copy(media_info)
+        with _stage(recorder, on_stage, STAGE_MUX) as span:
+            span.bytes_read = temp_video_path.stat().st_size + audio_path.stat().st_size
+            final_video_path, mux_notes = mux_audio_with_video(
+                temp_video_path,
+                audio_path,
+                video_info=media_info,
+                audio_duration_s=audio_duration_s,
+                output_path=artifacts.new_path("-preview.mp4" if preview else ".mp4"),
+                cancel_event=cancel_event,
+                preview=preview,
+            )
+            span.bytes_written = final_video_path.stat().st_size
+
+        render_cancel_event: threading.Event | None = None
+        if preview:
+            render_cancel_event = threading.Event()
+            pending_video = _render_executor().submit(
+                _render_full_video,
+                video_artifact,
+                audio_path,
+                media_info,
+                audio_duration_s,
+                artifacts.new_path(".mp4"),
+                render_cancel_event,
+            )
+        else:
+            video_artifact.discard()
 
         status_notes = []
-        for note in llm_notes + tts_notes + mux_notes:
+        for note in speech_notes + fit_notes + mux_notes:
             if note and note not in status_notes:
                 status_notes.append(note)
 
-        return PipelineResult(
+        result = PipelineResult(
             commentary_text=commentary_text,
             audio_path=audio_path,
             video_path=final_video_path,
             duration_s=duration_s,
             status_notes=status_notes,
+            media_info=media_info,
+            artifacts=artifacts,
+            spans=recorder.spans,
+            preview_path=final_video_path if preview else None,
+            pending_video=pending_video,
+            render_cancel_event=render_cancel_event,
         )
-    except (ValidationError, ExternalServiceError, MuxingError, PipelineError):
+        if result_cache is not None and cache_key is not None:
+            if pending_video is None:
+                result_cache.put(cache_key, result)
+            else:
+                # Only the full-quality render is worth serving again.
+                pending_video.add_done_callback(partial(_cache_full_render, result_cache, cache_key, result))
+        return result
+    except (ValidationError, ExternalServiceError, MuxingError, CancellationError, PipelineError):
         raise
     except Exception as exc:  # pragma: no cover - defensive catch-all
         raise PipelineError(
@@ -88,7 +380,62 @@ def generate_commentated_clip(
             user_hint="Please retry; if the issue persists, contact support."
         ) from exc
     finally:
-        if temp_video_path.exists():
-            temp_video_path.unlink(missing_ok=True)
-        if final_video_path is None and audio_path is not None:
-            audio_path.unlink(missing_ok=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+        if pending_video is None:
+            video_artifact.discard()
+        if result is None:
+            artifacts.cleanup()
+        if recorder.spans:
+            emit_spans(
+                default_sinks() if metrics_sinks is None else metrics_sinks,
+                list(recorder.spans),
+                result.status_notes if result is not None else [],
+            )
+
+
+def generate_commentated_clip(
+    *,
+    video_bytes: bytes | None = None,
+    video_path: Path | str | None = None,
+    video_stream: BinaryIO | None = None,
+    filename: str,
+    vibe: str,
+    team_a: str | None,
+    team_b: str | None,
+    key_moments: str | None,
+    language: str | None,
+    tts_provider: str | None,
+    llm_client: Optional[LLMClient] = None,
+    tts_service: Optional[TTSService] = None,
+    result_cache: Optional[ResultCache] = None,
+    stream_tts: bool | None = None,
+    on_stage: Optional[StageCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+    metrics_sinks: Optional[Sequence[MetricsSink]] = None,
+    preview_first: bool = False,
+    profile: bool | None = None,
+) -> PipelineResult:
+    with profile_run(profile) as capture:
+        result = _run_pipeline(
+            video_bytes=video_bytes,
+            video_path=video_path,
+            video_stream=video_stream,
+            filename=filename,
+            vibe=vibe,
+            team_a=team_a,
+            team_b=team_b,
+            key_moments=key_moments,
+            language=language,
+            tts_provider=tts_provider,
+            llm_client=llm_client,
+            tts_service=tts_service,
+            result_cache=result_cache,
+            stream_tts=stream_tts,
+            on_stage=on_stage,
+            cancel_event=cancel_event,
+            metrics_sinks=metrics_sinks,
+            preview_first=preview_first,
+        )
+        if capture is not None:
+            result.profile_path = capture.profile_path
+        return result
@@ -0,0 +1,184 @@
+"""Sampled CPU and allocation profiling of pipeline runs."""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .artifacts import artifact_root
+from .constants import PROFILE_TOP_N, PROFILE_TRACEMALLOC_FRAMES
+
+_ACTIVE_CAPTURE: contextvars.ContextVar["ProfileCapture | None"] = contextvars.ContextVar(
+    "active_profile_capture", default=None
+)
+_TRACEMALLOC_LOCK = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def profile_directory() -> Path:
+    directory = Path(os.getenv("PIPELINE_PROFILE_DIR") or artifact_root() / "commentator-profiles")
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def should_profile(profile: bool | None = None) -> bool:
+    if profile is not None:
+        return profile
+    try:
+        rate = float(os.getenv("PIPELINE_PROFILE_RATE") or 0)
+    except ValueError:
+        return False
+    return rate > 0 and random.random() < rate
+
+
+def _acquire_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _TRACEMALLOC_LOCK:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc() -> None:
+    # Tracing the caller started before the sampled run is left running.
+    global _tracemalloc_users, _tracemalloc_owned
+    with _TRACEMALLOC_LOCK:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+class ProfileCapture:
+    def __init__(self, directory: Path, *, top_n: int = PROFILE_TOP_N) -> None:
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.profile_path = directory / f"{run_id}.prof"
+        self.summary_path = directory / f"{run_id}.txt"
+        self.top_n = top_n
+        self._profiles: list[cProfile.Profile] = []
+        self._skipped_threads = 0
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._start_snapshot: tracemalloc.Snapshot | None = None
+
+    def profile_call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per interpreter; that profiler already sees this thread.
+            with self._lock:
+                self._skipped_threads += 1
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._profiles.append(profiler)
+
+    def start(self) -> bool:
+        main_profiler = cProfile.Profile()
+        try:
+            main_profiler.enable()
+        except ValueError:
+            return False
+        self._profiles.append(main_profiler)
+        _acquire_tracemalloc()
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        return True
+
+    def finish(self) -> None:
+        self._profiles[0].disable()
+        wall_s = time.perf_counter() - self._started
+        try:
+            end_snapshot = tracemalloc.take_snapshot()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            _release_tracemalloc()
+
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        stats.dump_stats(str(self.profile_path))
+        self.summary_path.write_text(
+            self._render_summary(stats, end_snapshot, peak_bytes, wall_s, len(profiles) - 1), encoding="utf-8"
+        )
+
+    def _render_summary(
+        self,
+        stats: pstats.Stats,
+        end_snapshot: tracemalloc.Snapshot,
+        peak_bytes: int,
+        wall_s: float,
+        worker_calls: int,
+    ) -> str:
+        buffer = io.StringIO()
+        stats.stream = buffer  # type: ignore[attr-defined]
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+
+        noise = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+        growth = end_snapshot.filter_traces(noise).compare_to(self._start_snapshot.filter_traces(noise), "lineno")
+        allocation_lines = [str(stat) for stat in growth[: self.top_n] if stat.size_diff > 0]
+
+        header = [
+            f"Profile: {self.profile_path.name}",
+            f"Wall time: {wall_s:.3f}s, with {worker_calls} worker-thread call(s) merged in",
+            f"Peak traced memory: {peak_bytes / (1024 * 1024):.1f} MiB",
+        ]
+        if self._skipped_threads:
+            header.append(f"Worker calls covered by an already active profiler: {self._skipped_threads}")
+        sections = [
+            "\n".join(header),
+            f"Top {self.top_n} functions by cumulative time\n{buffer.getvalue().strip()}",
+            f"Top {self.top_n} allocations still held at the end of the run\n" + "\n".join(allocation_lines),
+        ]
+        return "\n\n".join(sections) + "\n"
+
+
+@contextmanager
+def profile_run(profile: bool | None = None) -> Iterator[ProfileCapture | None]:
+    if not should_profile(profile) or _ACTIVE_CAPTURE.get() is not None:
+        yield None
+        return
+
+    capture = ProfileCapture(profile_directory())
+    if not capture.start():
+        # Another run holds the interpreter-wide profiler (Python 3.12+); this one goes unprofiled.
+        yield None
+        return
+    token = _ACTIVE_CAPTURE.set(capture)
+    try:
+        yield capture
+    finally:
+        _ACTIVE_CAPTURE.reset(token)
+        try:
+            capture.finish()
+        except OSError:  # pragma: no cover - profiling is best effort
+            pass
+
+
+def run_profiled(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    capture = _ACTIVE_CAPTURE.get()
+    if capture is None:
+        return func(*args, **kwargs)
+    return capture.profile_call(func, *args, **kwargs)
@@ -0,0 +1,41 @@
+"""Sentence segmentation for commentary text and streamed LLM tokens."""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator
+
+from .constants import MIN_TTS_CHUNK_CHARS
+
+_SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _clean_sentence(text: str) -> str:
+    return text.strip().strip('"').strip()
+
+
+def iter_sentences(chunks: Iterable[str], *, min_chars: int = MIN_TTS_CHUNK_CHARS) -> Iterator[str]:
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        search_from = 0
+        while True:
+            match = _SENTENCE_BOUNDARY_RE.search(buffer, search_from)
+            if match is None:
+                break
+            sentence = _clean_sentence(buffer[:match.start()])
+            if len(sentence) < min_chars:
+                # Very short bursts ("GOAL!") ride along with the next sentence.
+                search_from = match.end()
+                continue
+            yield sentence
+            buffer = buffer[match.end():]
+            search_from = 0
+
+    tail = _clean_sentence(buffer)
+    if tail:
+        yield tail
+
+
+def split_sentences(text: str, *, min_chars: int = MIN_TTS_CHUNK_CHARS) -> list[str]:
+    return list(iter_sentences([text], min_chars=min_chars))
@@ -0,0 +1,86 @@
+"""Sentence-level pipelining of streamed LLM output into TTS."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from .audio import concat_audio
+from .constants import STREAM_TTS_WORKERS
+from .errors import PipelineError
+from .llm import LLMClient
+from .metrics import bind_run_context
+from .prompting import PromptContext
+from .sentences import iter_sentences
+from .tts import TTSService
+
+
+def _discard_segments(futures: Iterable[Future]) -> None:
+    def _cleanup(done: Future) -> None:
+        if done.cancelled() or done.exception() is not None:
+            return
+        path, _ = done.result()
+        path.unlink(missing_ok=True)
+
+    for future in futures:
+        if not future.cancel():
+            future.add_done_callback(_cleanup)
+
+
+def stream_commentary(
+    llm_client: LLMClient,
+    tts_service: TTSService,
+    prompt_ctx: PromptContext,
+    tts_provider: str | None,
+    *,
+    max_workers: int = STREAM_TTS_WORKERS,
+) -> Tuple[str, Path, list[str]]:
+    llm_notes: list[str] = []
+    sentences: list[str] = []
+    futures: list[Future] = []
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-stream")
+
+    try:
+        tokens = llm_client.stream(prompt_ctx.prompt, language=prompt_ctx.language, notes=llm_notes)
+        for sentence in iter_sentences(tokens):
+            sentences.append(sentence)
+            futures.append(
+                executor.submit(
+                    bind_run_context(tts_service.synthesize),
+                    sentence,
+                    provider=tts_provider,
+                    language=prompt_ctx.language,
+                    voice_hint=prompt_ctx.vibe_key,
+                )
+            )
+
+        if not sentences:
+            raise PipelineError(
+                message="LLM produced no commentary.",
+                error_code="llm_empty",
+                user_hint="Retry with more context."
+            )
+
+        segment_paths: list[Path] = []
+        tts_notes: list[str] = []
+        try:
+            for future in futures:
+                path, notes = future.result()
+                segment_paths.append(path)
+                tts_notes.extend(notes)
+            audio_path = concat_audio(segment_paths)
+        except BaseException:
+            for path in segment_paths:
+                path.unlink(missing_ok=True)
+            raise
+    except BaseException:
+        _discard_segments(futures)
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for path in segment_paths:
+        if path != audio_path:
+            path.unlink(missing_ok=True)
+    return " ".join(sentences), audio_path, llm_notes + tts_notes
@@ -2,29 +2,70 @@
 
 from __future__ import annotations
 
+import logging
 import os
-import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Iterable, Optional, Tuple
 
-import requests
 from gtts import gTTS
 
+from .artifacts import new_scratch_path
+from .audio import concat_audio
+from .audio_bank import MockAudioBank
+from .clients import get_http_session, get_replicate_client, http_timeout
 from .constants import (
     DEFAULT_LANGUAGE,
     DEFAULT_TTS_PROVIDER,
     GTTS_TLD_BY_VIBE,
     REPLICATE_TTS_MODEL,
+    STAGE_TTS,
     STATUS_FALLBACK_TTS,
+    STATUS_HEDGED_TTS,
     STATUS_MOCK_TTS,
+    TTS_CHUNK_CROSSFADE_MS,
+    TTS_HEDGE_DELAY_SECONDS,
+    TTS_HEDGE_PROVIDER,
+    TTS_PHRASE_MISS_WORKERS,
 )
 from .errors import ExternalServiceError
+from .health import ProviderHealthRegistry, provider_health
+from .local_tts import get_pyttsx3_worker, select_pyttsx3_voice
+from .metrics import bind_run_context, record_provider, record_retry
+from .sentences import split_sentences
+from .tts_cache import PhraseAudioCache
 
 try:  # pragma: no cover - optional dependency
     import replicate  # type: ignore
 except ImportError:  # pragma: no cover - fallback path
     replicate = None  # type: ignore
 
+_PYTTSX3_LOCK = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+def _discard_audio_result(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().unlink(missing_ok=True)
+
+
+@dataclass
+class VoiceSettings:
+    language_code: str
+    vibe_key: str
+    voice_hint: str
+    gtts_tld: str
+
+
+def _start_pyttsx3_worker() -> None:
+    try:
+        get_pyttsx3_worker().start()
+    except Exception:  # pragma: no cover - no local engine; gTTS still works
+        logger.warning("pyttsx3 warm-up failed; offline voices start on first use", exc_info=True)
+
 
 class TTSService:
     def __init__(
@@ -32,11 +73,38 @@ class TTSService:
         *,
         default_provider: str | None = None,
         allow_mock_fallback: bool = True,
+        phrase_cache: Optional[PhraseAudioCache] = None,
+        audio_bank: Optional[MockAudioBank] = None,
+        chunk_workers: int | None = None,
+        use_pyttsx3_worker: bool | None = None,
+        health: Optional[ProviderHealthRegistry] = None,
+        hedge_delay_s: float | str | None = None,
+        hedge_provider: str | None = None,
     ) -> None:
         self.default_provider = (default_provider or DEFAULT_TTS_PROVIDER).lower()
         self.allow_mock_fallback = allow_mock_fallback
         self.replicate_model = os.getenv("REPLICATE_TTS_MODEL", REPLICATE_TTS_MODEL)
         self.api_token = os.getenv("REPLICATE_API_TOKEN")
+        self.phrase_cache = phrase_cache if phrase_cache is not None else PhraseAudioCache.from_env()
+        self.audio_bank = audio_bank if audio_bank is not None else MockAudioBank.from_env()
+        self.chunk_workers = chunk_workers if chunk_workers is not None else int(os.getenv("TTS_CHUNK_WORKERS") or 0)
+        if use_pyttsx3_worker is None:
+            use_pyttsx3_worker = os.getenv("PYTTSX3_WORKER", "1").lower() not in {"0", "false", "no"}
+        self.use_pyttsx3_worker = use_pyttsx3_worker
+        self.health = health if health is not None else provider_health
+        if hedge_delay_s is None:
+            hedge_env = (os.getenv("TTS_HEDGE_DELAY") or "").strip().lower()
+            hedge_delay_s = hedge_env if hedge_env == "auto" else float(hedge_env) if hedge_env else None
+        self.hedge_delay_s = hedge_delay_s
+        self.hedge_provider = (hedge_provider or os.getenv("TTS_HEDGE_PROVIDER") or TTS_HEDGE_PROVIDER).lower()
+
+    def warm_up(self) -> None:
+        get_http_session()
+        if self.api_token and replicate is not None:
+            get_replicate_client(self.api_token)
+        if self.use_pyttsx3_worker:
+            # Starting the engine can take seconds, so it must not hold up app or API startup.
+            threading.Thread(target=_start_pyttsx3_worker, name="pyttsx3-warm-up", daemon=True).start()
 
     def synthesize(
         self,
@@ -50,30 +118,30 @@ class TTSService:
         if provider_key not in {"gtts", "replicate", "pyttsx3"}:
             provider_key = "gtts"
 
-        notes: list[str] = []
         language_code = (language or DEFAULT_LANGUAGE).split("-")[0]
         vibe_key = (voice_hint or "").lower()
-        gtts_tld = self._resolve_gtts_tld(vibe_key=vibe_key, language_code=language_code)
+        if self.audio_bank is not None:
+            bank_path = self.audio_bank.assemble(text, language=language_code, vibe=vibe_key)
+            if bank_path is not None:
+                return bank_path, []
+
+        voice = VoiceSettings(
+            language_code=language_code,
+            vibe_key=vibe_key,
+            voice_hint=voice_hint,
+            gtts_tld=self._resolve_gtts_tld(vibe_key=vibe_key, language_code=language_code),
+        )
 
         provider_chain = self._build_provider_chain(provider_key)
-        last_exception: Exception | None = None
-
-        for active_provider in provider_chain:
-            try:
-                if active_provider == "replicate":
-                    audio_path = self._synthesize_replicate(text, language_code, voice_hint)
-                    return audio_path, notes
-                if active_provider == "gtts":
-                    audio_path = self._synthesize_gtts(text, language_code, gtts_tld)
-                    return audio_path, notes
-                if active_provider == "pyttsx3":
-                    audio_path = self._synthesize_pyttsx3(text, language_code, vibe_key)
-                    return audio_path, notes
-            except Exception as exc:  # pragma: no cover - runtime/path issues
-                last_exception = exc
-                if active_provider != provider_chain[-1]:
-                    notes.append(STATUS_FALLBACK_TTS)
-                continue
+        if self.phrase_cache is not None or self.chunk_workers > 1:
+            audio_path, notes, last_exception = self._synthesize_sentences(text, provider_chain, voice)
+            if audio_path is None:
+                audio_path, _, chain_notes, last_exception = self._synthesize_with_chain(text, provider_chain, voice)
+                notes.extend(chain_notes)
+        else:
+            audio_path, _, notes, last_exception = self._synthesize_with_chain(text, provider_chain, voice)
+        if audio_path is not None:
+            return audio_path, notes
 
         if not self.allow_mock_fallback:
             raise ExternalServiceError(
@@ -86,6 +154,199 @@ class TTSService:
         audio_path = self._generate_placeholder_audio()
         return audio_path, notes
 
+    def _synthesize_with_chain(
+        self,
+        text: str,
+        provider_chain: list[str],
+        voice: VoiceSettings,
+    ) -> Tuple[Path | None, str | None, list[str], Exception | None]:
+        notes: list[str] = []
+        last_exception: Exception | None = None
+
+        ordered_chain = self.health.order(provider_chain)
+        if ordered_chain[:1] != provider_chain[:1]:
+            notes.append(STATUS_FALLBACK_TTS)
+
+        hedge_provider = self._select_hedge_provider(ordered_chain)
+        if hedge_provider is not None and self.health.get(ordered_chain[0]).allow_request():
+            audio_path, winner, attempted, last_exception = self._synthesize_hedged(
+                text, ordered_chain[0], hedge_provider, voice
+            )
+            if audio_path is not None:
+                if hedge_provider in attempted:
+                    notes.append(f"{STATUS_HEDGED_TTS} {winner}")
+                return audio_path, winner, notes, None
+            ordered_chain = [provider for provider in ordered_chain if provider not in attempted]
+            if ordered_chain:
+                notes.append(STATUS_FALLBACK_TTS)
+
+        for active_provider in ordered_chain:
+            if not self.health.get(active_provider).allow_request():
+                continue
+            try:
+                audio_path = self._timed_synthesis(active_provider, text, voice)
+                return audio_path, active_provider, notes, None
+            except Exception as exc:  # pragma: no cover - runtime/path issues
+                last_exception = exc
+                if active_provider != ordered_chain[-1]:
+                    notes.append(STATUS_FALLBACK_TTS)
+                continue
+
+        return None, None, notes, last_exception
+
+    def _select_hedge_provider(self, ordered_chain: list[str]) -> str | None:
+        if self.hedge_delay_s is None or len(ordered_chain) < 2:
+            return None
+        if self.hedge_provider in ordered_chain[1:]:
+            return self.hedge_provider
+        return ordered_chain[1]
+
+    def _hedge_delay(self, provider: str) -> float:
+        if self.hedge_delay_s == "auto":
+            p90 = self.health.get(provider).latency_percentile(0.9)
+            return p90 if p90 is not None else TTS_HEDGE_DELAY_SECONDS
+        return float(self.hedge_delay_s)
+
+    def _synthesize_hedged(
+        self,
+        text: str,
+        primary: str,
+        secondary: str,
+        voice: VoiceSettings,
+    ) -> Tuple[Path | None, str | None, list[str], Exception | None]:
+        attempted = [primary]
+        last_exception: Exception | None = None
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts-hedge")
+        try:
+            futures = {pool.submit(bind_run_context(self._timed_synthesis), primary, text, voice): primary}
+            done, _ = wait(futures, timeout=self._hedge_delay(primary))
+            if not done and self.health.get(secondary).allow_request():
+                futures[pool.submit(bind_run_context(self._timed_synthesis), secondary, text, voice)] = secondary
+                attempted.append(secondary)
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                succeeded = [future for future in done if future.exception() is None]
+                if succeeded:
+                    winner = succeeded[0]
+                    # The loser cannot be interrupted mid-request; drop its audio whenever it lands.
+                    for loser in (done | pending) - {winner}:
+                        loser.cancel()
+                        loser.add_done_callback(_discard_audio_result)
+                    return winner.result(), futures[winner], attempted, None
+                for future in done:
+                    last_exception = future.exception()
+            return None, None, attempted, last_exception
+        finally:
+            pool.shutdown(wait=False)
+
+    def _timed_synthesis(self, provider: str, text: str, voice: VoiceSettings) -> Path:
+        provider_state = self.health.get(provider)
+        started = time.monotonic()
+        try:
+            audio_path = self._synthesize_with_provider(provider, text, voice)
+        except Exception:
+            provider_state.record_failure(time.monotonic() - started)
+            record_retry(STAGE_TTS)
+            raise
+        provider_state.record_success(time.monotonic() - started)
+        record_provider(STAGE_TTS, provider)
+        return audio_path
+
+    def _synthesize_with_provider(self, provider: str, text: str, voice: VoiceSettings) -> Path:
+        if provider == "replicate":
+            return self._synthesize_replicate(text, voice.language_code, voice.voice_hint)
+        if provider == "gtts":
+            return self._synthesize_gtts(text, voice.language_code, voice.gtts_tld)
+        if provider == "pyttsx3":
+            return self._synthesize_pyttsx3(text, voice.language_code, voice.vibe_key)
+        raise ValueError(f"Unknown TTS provider: {provider}")
+
+    def _voice_signature(self, provider: str, voice: VoiceSettings) -> str:
+        if provider == "gtts":
+            return f"tld={voice.gtts_tld}"
+        if provider == "replicate":
+            return f"model={self.replicate_model};voice={voice.voice_hint}"
+        return f"vibe={voice.vibe_key};rate={self._resolve_pyttsx3_rate(voice.vibe_key)}"
+
+    def _phrase_key(self, provider: str, sentence: str, voice: VoiceSettings) -> str:
+        return PhraseAudioCache.make_key(
+            provider, voice.language_code, self._voice_signature(provider, voice), sentence
+        )
+
+    def _synthesize_sentence(
+        self,
+        sentence: str,
+        provider_chain: list[str],
+        voice: VoiceSettings,
+    ) -> Tuple[Path | None, list[str], Exception | None]:
+        if self.phrase_cache is not None:
+            cached_path = self.phrase_cache.get(self._phrase_key(provider_chain[0], sentence, voice))
+            if cached_path is not None:
+                return cached_path, [], None
+
+        audio_path, used_provider, notes, last_exception = self._synthesize_with_chain(
+            sentence, provider_chain, voice
+        )
+        if audio_path is not None and used_provider is not None and self.phrase_cache is not None:
+            self.phrase_cache.put(self._phrase_key(used_provider, sentence, voice), audio_path)
+        return audio_path, notes, last_exception
+
+    def _synthesize_sentences(
+        self,
+        text: str,
+        provider_chain: list[str],
+        voice: VoiceSettings,
+    ) -> Tuple[Path | None, list[str], Exception | None]:
+        sentences = split_sentences(text)
+        if not sentences:
+            return None, [], None
+
+        # Phrase-cache misses each cost a provider round trip, so a cold cache fetches them concurrently too.
+        # pyttsx3 renders one job at a time in a single engine, so concurrent chunks would only queue up.
+        workers = self.chunk_workers
+        if workers <= 1 and self.phrase_cache is not None:
+            workers = TTS_PHRASE_MISS_WORKERS
+        parallel = workers > 1 and len(sentences) > 1 and provider_chain[0] != "pyttsx3"
+        if parallel:
+            with ThreadPoolExecutor(max_workers=min(workers, len(sentences)), thread_name_prefix="tts-chunk") as pool:
+                synthesize_sentence = bind_run_context(self._synthesize_sentence)
+                outcomes = list(
+                    pool.map(lambda sentence: synthesize_sentence(sentence, provider_chain, voice), sentences)
+                )
+        else:
+            outcomes = [self._synthesize_sentence(sentence, provider_chain, voice) for sentence in sentences]
+
+        notes: list[str] = []
+        segment_paths: list[Path] = []
+        last_exception: Exception | None = None
+        for audio_path, sentence_notes, exc in outcomes:
+            notes.extend(sentence_notes)
+            if audio_path is None:
+                last_exception = exc
+            else:
+                segment_paths.append(audio_path)
+
+        try:
+            if last_exception is not None or len(segment_paths) != len(sentences):
+                raise last_exception or ExternalServiceError(
+                    message="TTS chunk synthesis failed.",
+                    error_code="tts_chunk_failure",
+                    user_hint="Try switching voice provider."
+                )
+            crossfade_ms = TTS_CHUNK_CROSSFADE_MS if parallel and self.chunk_workers > 1 else 0
+            combined_path = concat_audio(segment_paths, crossfade_ms=crossfade_ms)
+        except Exception as exc:  # pragma: no cover - stitching issues
+            for path in segment_paths:
+                path.unlink(missing_ok=True)
+            return None, notes, exc
+
+        for path in segment_paths:
+            if path != combined_path:
+                path.unlink(missing_ok=True)
+        return combined_path, notes, None
+
     def _build_provider_chain(self, primary: str) -> list[str]:
         chain: list[str] = []
 
@@ -119,11 +380,15 @@ class TTSService:
         return tld
 
     def _synthesize_gtts(self, text: str, language_code: str, tld: str) -> Path:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        with temp_file as fh:
-            tts = gTTS(text=text, lang=language_code, tld=tld)
-            tts.write_to_fp(fh)
-        return Path(temp_file.name)
+        output_path = new_scratch_path(".mp3")
+        try:
+            with output_path.open("wb") as fh:
+                tts = gTTS(text=text, lang=language_code, tld=tld)
+                tts.write_to_fp(fh)
+        except Exception:
+            output_path.unlink(missing_ok=True)
+            raise
+        return output_path
 
     def _synthesize_replicate(self, text: str, language_code: str, voice_hint: str) -> Path:
         if not self.api_token or not self.replicate_model or replicate is None:
@@ -133,13 +398,12 @@ class TTSService:
                 user_hint="Provide REPLICATE_API_TOKEN and REPLICATE_TTS_MODEL."
             )
 
-        client = replicate.Client(api_token=self.api_token)
+        client = get_replicate_client(self.api_token)
         output = client.run(
             self.replicate_model,
             input={"text": text, "voice": voice_hint, "language": language_code},
         )
 
-        audio_bytes: bytes | None = None
         url_candidates: Iterable[str] = []
         if isinstance(output, (list, tuple)):
             url_candidates = [str(item) for item in output]
@@ -150,29 +414,41 @@ class TTSService:
             if isinstance(data, str):
                 url_candidates = [data]
 
-        for candidate in url_candidates:
-            if candidate.startswith("http"):
-                response = requests.get(candidate, timeout=20)
-                response.raise_for_status()
-                audio_bytes = response.content
-                break
-
-        if audio_bytes is None and isinstance(output, (bytes, bytearray)):
-            audio_bytes = bytes(output)
+        output_path = new_scratch_path(".mp3")
+        try:
+            for candidate in url_candidates:
+                if candidate.startswith("http"):
+                    # Stream straight to disk instead of buffering the whole clip in memory.
+                    with get_http_session().get(candidate, timeout=http_timeout(), stream=True) as response:
+                        response.raise_for_status()
+                        with output_path.open("wb") as fh:
+                            for chunk in response.iter_content(chunk_size=64 * 1024):
+                                fh.write(chunk)
+                    return output_path
+
+            if isinstance(output, (bytes, bytearray)):
+                output_path.write_bytes(output)
+                return output_path
+        except Exception:
+            output_path.unlink(missing_ok=True)
+            raise
+
+        output_path.unlink(missing_ok=True)
+        raise ExternalServiceError(
+            message="Replicate TTS did not return audio bytes.",
+            error_code="replicate_tts_empty",
+            user_hint="Try again or switch to default voice."
+        )
 
-        if audio_bytes is None:
-            raise ExternalServiceError(
-                message="Replicate TTS did not return audio bytes.",
-                error_code="replicate_tts_empty",
-                user_hint="Try again or switch to default voice."
+    def _synthesize_pyttsx3(self, text: str, language_code: str, vibe_key: str) -> Path:
+        if self.use_pyttsx3_worker:
+            return get_pyttsx3_worker().synthesize(
+                text,
+                language_code=language_code,
+                vibe_key=vibe_key,
+                rate=self._resolve_pyttsx3_rate(vibe_key),
             )
 
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        with temp_file as fh:
-            fh.write(audio_bytes)
-        return Path(temp_file.name)
-
-    def _synthesize_pyttsx3(self, text: str, language_code: str, vibe_key: str) -> Path:
         try:
             import pyttsx3  # type: ignore
         except ImportError as exc:  # pragma: no cover - optional dependency
@@ -182,43 +458,25 @@ class TTSService:
                 user_hint="Run `pip install pyttsx3` and retry."
             ) from exc
 
-        engine = pyttsx3.init()
-        voice_id = self._select_pyttsx3_voice(engine, language_code, vibe_key)
-        if voice_id:
-            engine.setProperty("voice", voice_id)
+        temp_path = new_scratch_path(".wav")
 
-        engine.setProperty("rate", self._resolve_pyttsx3_rate(vibe_key))
-        engine.setProperty("volume", 1.0)
+        # pyttsx3 drives one shared engine per process, so concurrent chunks take turns.
+        with _PYTTSX3_LOCK:
+            engine = pyttsx3.init()
+            voice_id = self._select_pyttsx3_voice(engine, language_code, vibe_key)
+            if voice_id:
+                engine.setProperty("voice", voice_id)
 
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        temp_path = Path(temp_file.name)
-        temp_file.close()
-        engine.save_to_file(text, str(temp_path))
-        engine.runAndWait()
-        engine.stop()
+            engine.setProperty("rate", self._resolve_pyttsx3_rate(vibe_key))
+            engine.setProperty("volume", 1.0)
+
+            engine.save_to_file(text, str(temp_path))
+            engine.runAndWait()
+            engine.stop()
         return temp_path
 
     def _select_pyttsx3_voice(self, engine: "pyttsx3.Engine", language_code: str, vibe_key: str) -> str | None:
-        voices = engine.getProperty("voices")
-        tokens = []
-        if language_code.startswith("es") or vibe_key == "latin radio":
-            tokens = ["es"]
-        elif language_code.startswith("ko"):
-            tokens = ["ko"]
-        elif vibe_key == "british pundit":
-            tokens = ["en-gb", "english"]
-        else:
-            tokens = ["en"]
-
-        for voice in voices:
-            sample = " ".join([
-                voice.id.lower(),
-                voice.name.lower(),
-                " ".join(str(lang).lower() for lang in getattr(voice, "languages", [])),
-            ])
-            if all(token in sample for token in tokens):
-                return voice.id
-        return None
+        return select_pyttsx3_voice(engine, language_code, vibe_key)
 
     def _resolve_pyttsx3_rate(self, vibe_key: str) -> int:
         if vibe_key == "latin radio":
@@ -232,18 +490,18 @@ class TTSService:
         return 185
 
     def _generate_placeholder_audio(self) -> Path:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+        output_path = new_scratch_path(".wav")
         sample_rate = 16000
         duration_seconds = 2
         total_frames = sample_rate * duration_seconds
         import wave
         import array
 
-        with wave.open(temp_file, "w") as wav_file:
+        with wave.open(str(output_path), "w") as wav_file:
             wav_file.setnchannels(1)
             wav_file.setsampwidth(2)
             wav_file.setframerate(sample_rate)
             silence = array.array("h", [0] * total_frames)
             wav_file.writeframes(silence.tobytes())
 
-        return Path(temp_file.name)
+        return output_path
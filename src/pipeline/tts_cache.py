@@ -0,0 +1,79 @@
+"""Sentence-level audio cache for synthesized commentary phrases."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .artifacts import new_scratch_path
+from .constants import TTS_PHRASE_CACHE_MAX_MB
+
+
+class PhraseAudioCache:
+    def __init__(self, directory: Path | str, *, max_bytes: int | None = None) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else TTS_PHRASE_CACHE_MAX_MB * 1024 * 1024
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["PhraseAudioCache"]:
+        directory = os.getenv("TTS_PHRASE_CACHE_DIR")
+        if not directory:
+            return None
+        max_mb = os.getenv("TTS_PHRASE_CACHE_MAX_MB")
+        return cls(directory, max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else None)
+
+    @staticmethod
+    def make_key(provider: str, language_code: str, voice_signature: str, text: str) -> str:
+        payload = json.dumps([provider, language_code, voice_signature, text.strip()], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Path | None:
+        for cached_path in self.directory.glob(f"{key}.*"):
+            scratch_path = new_scratch_path(cached_path.suffix)
+            try:
+                shutil.copyfile(cached_path, scratch_path)
+                os.utime(cached_path, None)
+            except OSError:  # evicted while we were reading it
+                scratch_path.unlink(missing_ok=True)
+                return None
+            return scratch_path
+        return None
+
+    def put(self, key: str, audio_path: Path) -> None:
+        target = self.directory / f"{key}{audio_path.suffix}"
+        temp_file = tempfile.NamedTemporaryFile(delete=False, dir=self.directory, suffix=".tmp")
+        try:
+            with temp_file as fh, audio_path.open("rb") as src:
+                shutil.copyfileobj(src, fh)
+            os.replace(temp_file.name, target)
+        except OSError:  # pragma: no cover - cache writes are best effort
+            Path(temp_file.name).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            for cached_path in self.directory.iterdir():
+                if cached_path.suffix == ".tmp":
+                    continue
+                try:
+                    stat = cached_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, cached_path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, cached_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                cached_path.unlink(missing_ok=True)
+                total -= size
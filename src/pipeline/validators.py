@@ -4,13 +4,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
-try:
-    from moviepy.editor import VideoFileClip
-except ImportError:  # moviepy>=2.0 namespace
-    from moviepy.video.io.VideoFileClip import VideoFileClip
-
 from .constants import ALLOWED_VIDEO_EXTENSIONS, MAX_VIDEO_MB, MAX_VIDEO_SECONDS
 from .errors import ValidationError
+from .models import MediaInfo
+from .probe import probe_video
 
 
 def validate_extension(filename: str) -> None:
@@ -33,20 +30,10 @@ def validate_filesize(num_bytes: int) -> None:
         )
 
 
-def validate_duration(video_path: Path) -> float:
-    clip: VideoFileClip | None = None
-    try:
-        clip = VideoFileClip(str(video_path))
-        duration = float(clip.duration or 0.0)
-    except OSError as exc:
-        raise ValidationError(
-            message="Unable to read video duration.",
-            error_code="invalid_video",
-            user_hint="Ensure the file is a playable mp4/mov/webm clip."
-        ) from exc
-    finally:
-        if clip is not None:
-            clip.close()
+def validate_duration(video_path: Path, media_info: MediaInfo | None = None) -> float:
+    if media_info is None:
+        media_info = probe_video(video_path)
+    duration = float(media_info.duration_s or 0.0)
 
     if duration <= 0:
         raise ValidationError(
@@ -65,7 +52,12 @@ def validate_duration(video_path: Path) -> float:
     return duration
 
 
-def validate_upload(filename: str, num_bytes: int, temp_path: Path) -> float:
+def validate_upload(
+    filename: str,
+    num_bytes: int,
+    temp_path: Path,
+    media_info: MediaInfo | None = None,
+) -> float:
     validate_extension(filename)
     validate_filesize(num_bytes)
-    return validate_duration(temp_path)
+    return validate_duration(temp_path, media_info)
@@ -0,0 +1,76 @@
+import wave
+
+import numpy as np
+import pytest
+
+from src.pipeline.audio_fit import fit_audio
+from src.pipeline.constants import (
+    AUDIO_FIT_MAX_RATIO,
+    AUDIO_PEAK_DBFS,
+    AUDIO_TARGET_DBFS,
+    STATUS_FITTED_AUDIO,
+    STATUS_TRIMMED_AUDIO,
+)
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture(autouse=True)
+def no_crowd_bed(tmp_path, monkeypatch):
+    monkeypatch.delenv("CROWD_BED_PATH", raising=False)
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path / "artifacts"))
+
+
+def _speech(tmp_path, seconds: float, amplitude: float = 0.3):
+    # A steady tone stands in for speech: no silent edges, so only fitting changes the length.
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = (amplitude * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2")
+    path = tmp_path / "speech.wav"
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(samples.tobytes())
+    return path
+
+
+def _read(path):
+    with wave.open(str(path), "rb") as wav_file:
+        return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2") / 32767.0
+
+
+def test_speech_within_the_ratio_is_compressed_to_the_clip(tmp_path):
+    output_path, duration, notes = fit_audio(_speech(tmp_path, 11.0), 10.0, output_path=tmp_path / "fit.wav")
+
+    assert notes == [STATUS_FITTED_AUDIO]
+    assert duration == pytest.approx(10.0, abs=0.05)
+    assert _read(output_path).size / SAMPLE_RATE == pytest.approx(duration)
+
+
+def test_speech_beyond_the_ratio_is_compressed_then_trimmed_with_a_fade(tmp_path):
+    clip_s = 6.0
+    output_path, duration, notes = fit_audio(_speech(tmp_path, 10.0), clip_s, output_path=tmp_path / "fit.wav")
+
+    assert 10.0 / AUDIO_FIT_MAX_RATIO > clip_s
+    assert notes == [STATUS_FITTED_AUDIO, STATUS_TRIMMED_AUDIO]
+    assert duration == pytest.approx(clip_s, abs=1 / SAMPLE_RATE)
+    samples = _read(output_path)
+    tail = np.abs(samples[-SAMPLE_RATE // 200 :]).max()
+    body = np.abs(samples[: SAMPLE_RATE]).max()
+    assert tail < 0.2 * body
+
+
+def test_speech_shorter_than_the_clip_keeps_its_length(tmp_path):
+    output_path, duration, notes = fit_audio(_speech(tmp_path, 4.0), 10.0, output_path=tmp_path / "fit.wav")
+
+    assert notes == []
+    assert duration == pytest.approx(4.0, abs=0.02)
+
+
+@pytest.mark.parametrize("amplitude", [0.02, 0.9])
+def test_loudness_is_normalised_under_the_peak_ceiling(tmp_path, amplitude):
+    output_path, _, _ = fit_audio(_speech(tmp_path, 4.0, amplitude), None, output_path=tmp_path / "fit.wav")
+
+    samples = _read(output_path)
+    assert np.sqrt(np.mean(np.square(samples))) == pytest.approx(10 ** (AUDIO_TARGET_DBFS / 20), rel=0.02)
+    assert np.abs(samples).max() <= 10 ** (AUDIO_PEAK_DBFS / 20)
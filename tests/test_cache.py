@@ -0,0 +1,129 @@
+import dataclasses
+import os
+import time
+
+import pytest
+
+from src.pipeline import cache as cache_module
+from src.pipeline.cache import ResultCache
+from src.pipeline.constants import (
+    STATUS_CACHED_RESULT,
+    STATUS_FALLBACK_TTS,
+    STATUS_FITTED_AUDIO,
+    STATUS_MOCK_LLM,
+    STATUS_MOCK_TTS,
+    STATUS_TRUNCATED_LLM,
+)
+from src.pipeline.models import PipelineResult
+from src.pipeline.prompting import PromptContext
+
+VIDEO = b"\x00\x00\x00\x18ftypisom" + bytes(64)
+PROMPT = PromptContext(prompt="Call the goal.", language="en", vibe_key="hype")
+
+
+@pytest.fixture(autouse=True)
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path / "artifacts"))
+
+
+def _result(tmp_path, name: str = "run", *, notes=(), payload: bytes = b"x" * 1000) -> PipelineResult:
+    audio_path = tmp_path / f"{name}.wav"
+    video_path = tmp_path / f"{name}.mp4"
+    audio_path.write_bytes(payload)
+    video_path.write_bytes(payload)
+    return PipelineResult(
+        commentary_text=f"Commentary for {name}",
+        audio_path=audio_path,
+        video_path=video_path,
+        duration_s=12.0,
+        status_notes=list(notes),
+    )
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        {"video": VIDEO + b"\x01"},
+        {"prompt": dataclasses.replace(PROMPT, prompt="Call the save.")},
+        {"prompt": dataclasses.replace(PROMPT, language="es")},
+        {"prompt": dataclasses.replace(PROMPT, vibe_key="british pundit")},
+        {"provider": "pyttsx3"},
+    ],
+    ids=["video", "prompt", "language", "vibe", "provider"],
+)
+def test_key_changes_with_every_input(changed):
+    base = ResultCache.make_key(VIDEO, PROMPT, "gtts")
+    key = ResultCache.make_key(
+        changed.get("video", VIDEO), changed.get("prompt", PROMPT), changed.get("provider", "gtts")
+    )
+
+    assert key != base
+
+
+def test_key_is_stable_for_equal_inputs():
+    assert ResultCache.make_key(VIDEO, PROMPT, "gtts") == ResultCache.make_key(memoryview(VIDEO), PROMPT, "gtts")
+
+
+def test_put_then_get_returns_a_copy_marked_cached(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    original = _result(tmp_path, notes=[STATUS_FITTED_AUDIO])
+    cache.put("key", original)
+
+    cached = cache.get("key")
+
+    assert cached.commentary_text == original.commentary_text
+    assert cached.status_notes == [STATUS_FITTED_AUDIO, STATUS_CACHED_RESULT]
+    assert cached.video_path != original.video_path
+    assert cached.video_path.read_bytes() == original.video_path.read_bytes()
+    cached.cleanup()
+    assert not cached.video_path.exists()
+
+
+@pytest.mark.parametrize("note", [STATUS_MOCK_LLM, STATUS_FALLBACK_TTS, STATUS_MOCK_TTS, STATUS_TRUNCATED_LLM])
+def test_put_skips_degraded_results(tmp_path, note):
+    cache = ResultCache(tmp_path / "cache")
+
+    cache.put("key", _result(tmp_path, notes=[note]))
+
+    assert cache.get("key") is None
+    assert not (tmp_path / "cache" / "key").exists()
+
+
+def test_get_drops_expired_entries(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache", ttl_seconds=60)
+    cache.put("key", _result(tmp_path))
+    now = time.time()
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 59)
+    fresh = cache.get("key")
+    assert fresh is not None
+    fresh.cleanup()
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 61)
+    assert cache.get("key") is None
+    assert not (tmp_path / "cache" / "key").exists()
+
+
+def test_put_evicts_least_recently_used_entries_over_the_size_bound(tmp_path):
+    # Each entry holds 2 KB of media plus its metadata, so the bound fits two of them.
+    cache = ResultCache(tmp_path / "cache", max_bytes=5000)
+    for index, name in enumerate(("first", "second")):
+        cache.put(name, _result(tmp_path, name))
+        os.utime(tmp_path / "cache" / name / "meta.json", (1000 + index, 1000 + index))
+    cache.get("first").cleanup()
+
+    cache.put("third", _result(tmp_path, "third"))
+
+    assert sorted(path.name for path in (tmp_path / "cache").iterdir()) == ["first", "third"]
+
+
+def test_evict_drops_expired_and_unreadable_entries(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache", ttl_seconds=60)
+    cache.put("expired", _result(tmp_path, "expired"))
+    (tmp_path / "cache" / "broken").mkdir()
+    now = time.time()
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 61)
+    cache.evict()
+
+    assert list((tmp_path / "cache").iterdir()) == []
@@ -0,0 +1,111 @@
+import pytest
+
+from src.pipeline import health
+from src.pipeline.health import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    ProviderHealth,
+    ProviderHealthRegistry,
+)
+
+COOLDOWN_S = 30.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(health.time, "monotonic", fake)
+    return fake
+
+
+def _breaker(**overrides) -> ProviderHealth:
+    settings = dict(consecutive_failures=3, min_samples=10, error_rate_threshold=0.5, cooldown_s=COOLDOWN_S)
+    settings.update(overrides)
+    return ProviderHealth("gtts", **settings)
+
+
+def _trip(breaker: ProviderHealth) -> None:
+    for _ in range(breaker.consecutive_failures_threshold):
+        breaker.record_failure(0.1)
+
+
+def test_consecutive_failures_open_the_breaker(clock):
+    breaker = _breaker()
+    breaker.record_failure(0.1)
+    breaker.record_failure(0.1)
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure(0.1)
+
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert not breaker.is_available()
+
+
+def test_error_rate_opens_the_breaker(clock):
+    breaker = _breaker(consecutive_failures=100, min_samples=4)
+    for _ in range(2):
+        breaker.record_success(0.1)
+        breaker.record_failure(0.1)
+
+    assert breaker.state == STATE_OPEN
+
+
+def test_cooldown_moves_open_to_half_open_with_a_single_probe(clock):
+    breaker = _breaker()
+    _trip(breaker)
+
+    clock.now += COOLDOWN_S - 0.1
+    assert breaker.state == STATE_OPEN
+
+    clock.now += 0.1
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.is_available()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert not breaker.is_available()
+
+
+def test_successful_probe_closes_the_breaker_with_a_fresh_window(clock):
+    breaker = _breaker()
+    _trip(breaker)
+    clock.now += COOLDOWN_S
+    assert breaker.allow_request()
+
+    breaker.record_success(0.2)
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.snapshot()["samples"] == 1
+    breaker.record_failure(0.1)
+    assert breaker.state == STATE_CLOSED
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = _breaker()
+    _trip(breaker)
+    clock.now += COOLDOWN_S
+    assert breaker.allow_request()
+
+    breaker.record_failure(0.1)
+
+    assert breaker.state == STATE_OPEN
+    clock.now += COOLDOWN_S
+    assert breaker.state == STATE_HALF_OPEN
+
+
+def test_registry_orders_open_providers_out(clock):
+    registry = ProviderHealthRegistry()
+    _trip(registry.get("gtts"))
+    assert registry.order(["gtts", "pyttsx3"]) == ["pyttsx3"]
+
+    clock.now += health.BREAKER_COOLDOWN_SECONDS
+    assert registry.order(["gtts", "pyttsx3"]) == ["gtts", "pyttsx3"]
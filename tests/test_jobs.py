@@ -0,0 +1,53 @@
+import pytest
+
+from src.pipeline.constants import STAGE_AUDIO, STAGE_LLM, STAGE_MUX, STAGE_TTS, STAGE_VALIDATE
+from src.pipeline.jobs import Job
+
+
+def _job(*events) -> Job:
+    job = Job(job_id="job")
+    for stage, status in events:
+        job.record_stage(stage, status)
+    return job
+
+
+def test_running_stages_report_the_latest_active_one():
+    job = _job((STAGE_VALIDATE, "started"), (STAGE_LLM, "started"), (STAGE_VALIDATE, "finished"))
+
+    assert job.current_stage == STAGE_LLM
+    assert job.progress == pytest.approx(0.2)
+
+
+def test_failed_validation_ignores_the_discarded_speech_stages():
+    job = _job(
+        (STAGE_VALIDATE, "started"),
+        (STAGE_LLM, "started"),
+        (STAGE_LLM, "finished"),
+        (STAGE_TTS, "started"),
+        (STAGE_TTS, "finished"),
+        (STAGE_VALIDATE, "failed"),
+    )
+
+    assert job.failed_stage == STAGE_VALIDATE
+    assert job.current_stage == STAGE_VALIDATE
+    assert job.progress == 0.0
+
+
+def test_failed_speech_keeps_the_validation_progress():
+    job = _job(
+        (STAGE_VALIDATE, "started"),
+        (STAGE_LLM, "started"),
+        (STAGE_VALIDATE, "finished"),
+        (STAGE_LLM, "failed"),
+    )
+
+    assert job.current_stage == STAGE_LLM
+    assert job.progress == pytest.approx(0.2)
+
+
+def test_every_stage_finished_is_full_progress():
+    stages = (STAGE_VALIDATE, STAGE_LLM, STAGE_TTS, STAGE_AUDIO, STAGE_MUX)
+    job = _job(*((stage, status) for stage in stages for status in ("started", "finished")))
+
+    assert job.current_stage is None
+    assert job.progress == 1.0
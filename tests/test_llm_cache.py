@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.pipeline.llm_cache import CompletionCache
+
+CALLERS = 8
+
+
+def _run_concurrently(cache: CompletionCache, compute) -> list:
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        futures = [pool.submit(cache.get_or_compute, "key", compute) for _ in range(CALLERS)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def _blocking_compute(release: threading.Event, calls: list, result):
+    def compute():
+        calls.append(threading.get_ident())
+        # Hold the leader until every caller has had the chance to join the in-flight request.
+        release.wait(timeout=5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return compute
+
+
+def _release_later(release: threading.Event) -> None:
+    threading.Timer(0.2, release.set).start()
+
+
+def test_concurrent_callers_share_one_completion(tmp_path):
+    cache = CompletionCache(tmp_path)
+    release, calls = threading.Event(), []
+    _release_later(release)
+
+    results = _run_concurrently(cache, _blocking_compute(release, calls, "What a goal!"))
+
+    assert len(calls) == 1
+    assert results == ["What a goal!"] * CALLERS
+    assert cache.get_or_compute("key", lambda: pytest.fail("served from cache")) == "What a goal!"
+    assert (tmp_path / "key.json").exists()
+
+
+def test_concurrent_callers_share_the_leader_failure(tmp_path):
+    cache = CompletionCache(tmp_path)
+    release, calls = threading.Event(), []
+    failure = RuntimeError("provider down")
+    _release_later(release)
+
+    results = _run_concurrently(cache, _blocking_compute(release, calls, failure))
+
+    assert len(calls) == 1
+    assert results == [failure] * CALLERS
+    # The failure is not cached: the next caller computes again.
+    assert cache.get_or_compute("key", lambda: "Back on air") == "Back on air"
+
+
+def test_distinct_keys_do_not_coalesce():
+    cache = CompletionCache()
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return text
+
+    assert cache.get_or_compute("a", lambda: compute("first")) == "first"
+    assert cache.get_or_compute("b", lambda: compute("second")) == "second"
+    assert calls == ["first", "second"]
@@ -0,0 +1,108 @@
+import struct
+
+import pytest
+
+from src.pipeline.probe import probe_container, sniff_container
+
+
+def _box(box_type: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _full_box_times(version: int, timescale: int, duration: int) -> bytes:
+    if version == 1:
+        return bytes([1, 0, 0, 0]) + struct.pack(">QQIQ", 0, 0, timescale, duration)
+    return bytes(4) + struct.pack(">IIII", 0, 0, timescale, duration)
+
+
+def _trak(handler: bytes, fourcc: bytes, *, width: int = 0, height: int = 0, stts: bytes = b"") -> bytes:
+    sample_entry = _box(fourcc, bytes(24) + struct.pack(">HH", width, height) + bytes(50))
+    stsd = _box(b"stsd", bytes(4) + struct.pack(">I", 1) + sample_entry)
+    stbl = _box(b"stbl", stsd + (_box(b"stts", stts) if stts else b""))
+    hdlr = _box(b"hdlr", bytes(8) + handler + bytes(12))
+    mdhd = _box(b"mdhd", _full_box_times(0, 12800, 128000) + bytes(4))
+    return _box(b"trak", _box(b"mdia", mdhd + hdlr + _box(b"minf", stbl)))
+
+
+def _mp4(*, mvhd_version: int = 0, moov_first: bool = True) -> bytes:
+    mvhd = _box(b"mvhd", _full_box_times(mvhd_version, 1000, 12500) + bytes(80))
+    # 250 frames at 512 ticks on a 12800 timescale is 25 fps.
+    video = _trak(b"vide", b"avc1", width=1920, height=1080, stts=bytes(4) + struct.pack(">III", 1, 250, 512))
+    audio = _trak(b"soun", b"mp4a")
+    moov = _box(b"moov", mvhd + video + audio)
+    ftyp = _box(b"ftyp", b"isom" + bytes(4) + b"isomavc1")
+    mdat = _box(b"mdat", bytes(64))
+    return ftyp + (moov + mdat if moov_first else mdat + moov)
+
+
+def _ebml(element_id: int, payload: bytes) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + b"\x01" + len(payload).to_bytes(7, "big") + payload
+
+
+def _uint(element_id: int, value: int) -> bytes:
+    return _ebml(element_id, value.to_bytes(4, "big"))
+
+
+def _webm(*, unknown_segment_size: bool = False) -> bytes:
+    header = _ebml(0x1A45DFA3, _ebml(0x4282, b"webm"))
+    info = _ebml(0x1549A966, _uint(0x2AD7B1, 1_000_000) + _ebml(0x4489, struct.pack(">d", 8400.0)))
+    video_entry = _ebml(
+        0xAE,
+        _uint(0x83, 1)
+        + _ebml(0x86, b"V_VP9")
+        + _uint(0x23E383, 33_333_333)
+        + _ebml(0xE0, _uint(0xB0, 1280) + _uint(0xBA, 720)),
+    )
+    audio_entry = _ebml(0xAE, _uint(0x83, 2) + _ebml(0x86, b"A_OPUS"))
+    tracks = _ebml(0x1654AE6B, video_entry + audio_entry)
+    cluster = _ebml(0x1F43B675, bytes(32))
+    body = info + tracks + cluster
+    if unknown_segment_size:
+        return header + b"\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff" + body
+    return header + _ebml(0x18538067, body)
+
+
+@pytest.mark.parametrize("mvhd_version", [0, 1])
+@pytest.mark.parametrize("moov_first", [True, False])
+def test_probe_mp4_reads_duration_codecs_and_size(tmp_path, mvhd_version, moov_first):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(_mp4(mvhd_version=mvhd_version, moov_first=moov_first))
+
+    info = probe_container(clip)
+
+    assert sniff_container(clip) == "mp4"
+    assert info.container == "mp4"
+    assert info.duration_s == pytest.approx(12.5)
+    assert (info.video_codec, info.audio_codec) == ("h264", "aac")
+    assert (info.width, info.height) == (1920, 1080)
+    assert info.fps == pytest.approx(25.0)
+
+
+def test_probe_mp4_without_moov_returns_none(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(_box(b"ftyp", b"isom" + bytes(4)) + _box(b"mdat", bytes(16)))
+
+    assert probe_container(clip) is None
+
+
+@pytest.mark.parametrize("unknown_segment_size", [False, True])
+def test_probe_webm_reads_duration_codecs_and_size(tmp_path, unknown_segment_size):
+    clip = tmp_path / "clip.webm"
+    clip.write_bytes(_webm(unknown_segment_size=unknown_segment_size))
+
+    info = probe_container(clip)
+
+    assert sniff_container(clip) == "webm"
+    assert info.container == "webm"
+    assert info.duration_s == pytest.approx(8.4)
+    assert (info.video_codec, info.audio_codec) == ("vp9", "opus")
+    assert (info.width, info.height) == (1280, 720)
+    assert info.fps == pytest.approx(30.0)
+
+
+def test_probe_truncated_webm_returns_none(tmp_path):
+    clip = tmp_path / "clip.webm"
+    clip.write_bytes(_webm()[:40])
+
+    assert probe_container(clip) is None
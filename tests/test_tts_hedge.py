@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline.constants import STATUS_HEDGED_TTS
+from src.pipeline.health import ProviderHealthRegistry
+from src.pipeline.tts import TTSService, VoiceSettings
+
+HEDGE_DELAY_S = 0.05
+VOICE = VoiceSettings(language_code="en", vibe_key="", voice_hint="", gtts_tld="com")
+
+
+class FakeProviders:
+    """Stands in for the real providers; each one can be held back or made to fail."""
+
+    def __init__(self, tmp_path) -> None:
+        self.tmp_path = tmp_path
+        self.release = {"gtts": threading.Event(), "pyttsx3": threading.Event()}
+        self.failures: set[str] = set()
+        self.calls: list[str] = []
+        self.outputs: dict[str, object] = {}
+
+    def hold(self, provider: str) -> None:
+        self.release[provider].clear()
+
+    def __call__(self, provider: str, text: str, voice: VoiceSettings):
+        self.calls.append(provider)
+        self.release[provider].wait(timeout=5)
+        if provider in self.failures:
+            raise RuntimeError(f"{provider} failed")
+        path = self.tmp_path / f"{provider}.wav"
+        path.write_bytes(b"RIFF")
+        self.outputs[provider] = path
+        return path
+
+
+@pytest.fixture
+def providers(tmp_path):
+    fake = FakeProviders(tmp_path)
+    for event in fake.release.values():
+        event.set()
+    return fake
+
+
+@pytest.fixture
+def service(providers, monkeypatch):
+    tts = TTSService(
+        default_provider="gtts",
+        use_pyttsx3_worker=False,
+        health=ProviderHealthRegistry(),
+        hedge_delay_s=HEDGE_DELAY_S,
+        hedge_provider="pyttsx3",
+    )
+    monkeypatch.setattr(tts, "_synthesize_with_provider", providers)
+    return tts
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_fast_primary_wins_without_a_hedge(service, providers):
+    audio_path, winner, attempted, error = service._synthesize_hedged("Goal!", "gtts", "pyttsx3", VOICE)
+
+    assert (winner, attempted, error) == ("gtts", ["gtts"], None)
+    assert audio_path == providers.outputs["gtts"]
+    assert providers.calls == ["gtts"]
+
+
+def test_slow_primary_loses_to_the_hedge_and_its_audio_is_discarded(service, providers):
+    providers.hold("gtts")
+
+    audio_path, winner, attempted, error = service._synthesize_hedged("Goal!", "gtts", "pyttsx3", VOICE)
+
+    assert (winner, attempted, error) == ("pyttsx3", ["gtts", "pyttsx3"], None)
+    assert audio_path == providers.outputs["pyttsx3"]
+
+    providers.release["gtts"].set()
+    assert _wait_until(lambda: "gtts" in providers.outputs)
+    assert _wait_until(lambda: not providers.outputs["gtts"].exists())
+
+
+def test_slow_primary_still_wins_when_the_hedge_fails(service, providers):
+    providers.hold("gtts")
+    providers.failures.add("pyttsx3")
+    threading.Timer(0.2, providers.release["gtts"].set).start()
+
+    audio_path, winner, attempted, error = service._synthesize_hedged("Goal!", "gtts", "pyttsx3", VOICE)
+
+    assert (winner, attempted, error) == ("gtts", ["gtts", "pyttsx3"], None)
+    assert audio_path == providers.outputs["gtts"]
+
+
+def test_both_failing_reports_the_error(service, providers):
+    providers.hold("gtts")
+    providers.failures.update({"gtts", "pyttsx3"})
+    threading.Timer(0.2, providers.release["gtts"].set).start()
+
+    audio_path, winner, attempted, error = service._synthesize_hedged("Goal!", "gtts", "pyttsx3", VOICE)
+
+    assert (audio_path, winner) == (None, None)
+    assert attempted == ["gtts", "pyttsx3"]
+    assert isinstance(error, RuntimeError)
+
+
+def test_open_breaker_on_the_hedge_skips_it(service, providers):
+    hedge_health = service.health.get("pyttsx3")
+    for _ in range(hedge_health.consecutive_failures_threshold):
+        hedge_health.record_failure(0.1)
+    providers.hold("gtts")
+    threading.Timer(0.2, providers.release["gtts"].set).start()
+
+    _, winner, attempted, _ = service._synthesize_hedged("Goal!", "gtts", "pyttsx3", VOICE)
+
+    assert (winner, attempted) == ("gtts", ["gtts"])
+    assert providers.calls == ["gtts"]
+
+
+def test_chain_notes_the_hedge_winner(service, providers):
+    providers.hold("gtts")
+
+    audio_path, winner, notes, _ = service._synthesize_with_chain("Goal!", ["gtts", "pyttsx3"], VOICE)
+
+    assert winner == "pyttsx3"
+    assert notes == [f"{STATUS_HEDGED_TTS} pyttsx3"]
+    providers.release["gtts"].set()